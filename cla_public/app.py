@@ -13,13 +13,15 @@ import urllib3.contrib.pyopenssl
 import sentry_sdk
 from sentry_sdk.integrations.flask import FlaskIntegration
 
-from cla_public.django_to_jinja import change_jinja_templates
+from cla_public.django_to_jinja import change_jinja_templates, configure_template_cache
 from cla_public.apps.geocoder.views import geocoder
+from cla_public.apps.base.page_cache import cached_page
 from cla_public.apps.base.views import base
 from cla_public.apps.contact.views import contact
 from cla_public.apps.checker.views import checker
 from cla_public.apps.scope.urls import scope
-from cla_public.apps.checker.session import CheckerSessionInterface, CustomJSONEncoder
+from cla_public.apps.checker.categories import category_registry
+from cla_public.apps.checker.session import CustomJSONEncoder, create_session_interface
 from cla_public.libs import honeypot
 from cla_public.libs.utils import get_locale
 
@@ -36,9 +38,13 @@ def create_app(config_file=None):
         app.config.from_pyfile(config_file)
     else:
         app.config.from_envvar("CLA_PUBLIC_CONFIG")
+    app = configure_template_cache(app)
 
     app.babel = Babel(app)
     app.babel.localeselector(get_locale)
+    category_registry.translate(
+        os.path.join(app.root_path, "translations"), [code for code, label in app.config["LANGUAGES"]]
+    )
 
     app.cache = Cache(app)
 
@@ -47,7 +53,7 @@ def create_app(config_file=None):
     for extension in app.config["EXTENSIONS"]:
         extension.init_app(app)
 
-    app.session_interface = CheckerSessionInterface()
+    app.session_interface = create_session_interface(app)
     app.json_encoder = CustomJSONEncoder
 
     register_error_handlers(app)
@@ -75,7 +81,9 @@ def create_app(config_file=None):
 
 def register_error_handlers(app):
     """
-    Assign error page templates to all error status codes we care about
+    Assign error page templates to all error status codes we care about.
+    Each page is rendered once per worker and locale so error spikes don't
+    add rendering load.
     """
 
     error_handlers = {
@@ -85,8 +93,10 @@ def register_error_handlers(app):
     }
 
     def make_handler(code, template):
+        template_name = os.path.join("errors", template)
+
         def handler(e):
-            return render_template(os.path.join("errors", template), code=code), code
+            return cached_page(template_name, lambda: render_template(template_name, code=code), code)
 
         return handler
 
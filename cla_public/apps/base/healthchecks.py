@@ -4,6 +4,8 @@ import os
 import requests
 from flask import current_app
 
+from cla_public.libs.http_session import get_http_session
+
 
 HEALTHY = "healthy"
 UNHEALTHY = "unhealthy"
@@ -31,7 +33,7 @@ def check_backend_api():
     response_content = None
 
     try:
-        backend_healthcheck_response = requests.get(backend_healthcheck_url)
+        backend_healthcheck_response = get_http_session().get(backend_healthcheck_url)
         if backend_healthcheck_response.ok:
             status = HEALTHY
         response_content = backend_healthcheck_response.json()
@@ -40,3 +42,20 @@ def check_backend_api():
         response_content = e.__class__.__name__
 
     return {"status": status, "url": backend_healthcheck_url, "response": response_content}
+
+
+def check_cache():
+    """
+    Report cache hit ratios. A failing shared cache only makes the site
+    slower so is reported without making the service unhealthy.
+    """
+    cache = current_app.cache.cache
+    result = {"status": HEALTHY, "type": current_app.config.get("CACHE_TYPE")}
+    if hasattr(cache, "hit_ratios"):
+        result["hit_ratios"] = cache.hit_ratios()
+        try:
+            cache.shared.set("healthcheck", 1, timeout=10)
+            result["shared"] = cache.shared.get("healthcheck") == 1
+        except Exception as e:
+            result["shared"] = e.__class__.__name__
+    return result
@@ -0,0 +1,83 @@
+# coding: utf-8
+"Rendered static and error pages, cached per worker"
+
+import functools
+import hashlib
+import re
+
+from flask import current_app, request, session
+
+from cla_public.apps.base.extensions import is_quick_exit_enabled
+from cla_public.libs.ttl_cache import app_cache
+from cla_public.libs.utils import get_locale
+
+DEFAULT_CACHE = {"maxsize": 128, "ttl": 60 * 60}
+
+# base.html renders the raw locale cookie, so anything else is not cached
+LOCALE_COOKIE = re.compile(r"^[a-z]{2}(_[A-Z]{2})?$")
+
+
+def cache_config():
+    config = dict(DEFAULT_CACHE)
+    config.update(current_app.config.get("PAGE_CACHE", {}))
+    return config
+
+
+def page_variant():
+    """
+    The parts of the request a static page renders, or None when the page
+    should be rendered afresh.
+
+    Everything else the pages render comes from the app config, which is
+    fixed for the life of a worker, so pages cached per worker are dropped on
+    every deploy or config change.
+    """
+    cookie = request.cookies.get("locale")
+    if cookie is not None and not LOCALE_COOKIE.match(cookie):
+        return None
+    # rendering pops pending messages from the session
+    if "_flashes" in session:
+        return None
+    return get_locale(), cookie, is_quick_exit_enabled(session)
+
+
+def cached_page(name, render, status=200):
+    """
+    Response with the page rendered by `render`, rendering it only once per
+    worker for each locale. Successful pages answer conditional GETs with
+    304 Not Modified.
+    """
+    variant = page_variant()
+    if variant is None:
+        return render(), status
+
+    config = cache_config()
+    cache = app_cache("page_cache", config["maxsize"], config["ttl"])
+    key = (name, status) + variant
+    page = cache.get(key)
+    if page is None:
+        body = render()
+        page = body, hashlib.sha1(body.encode("utf-8")).hexdigest()
+        cache.set(key, page)
+
+    body, etag = page
+    response = current_app.response_class(body, status=status, mimetype="text/html")
+    response.vary.update(("Cookie", "Accept-Language"))
+    if status == 200:
+        response.set_etag(etag)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        response.make_conditional(request)
+    return response
+
+
+def cache_page(view):
+    """
+    Decorator for views whose page depends only on the locale and app config
+    """
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        return cached_page(request.endpoint, lambda: view(*args, **kwargs))
+
+    return wrapper
@@ -36,14 +36,14 @@ class DiskSpaceHealthcheckTest(unittest.TestCase):
 
 
 class BackendAPIHealthcheckTest(FlaskAppTestCase):
-    @mock.patch("requests.get")
+    @mock.patch("requests.Session.get")
     def test_backend_check_fails_if_request_fails(self, request_mock):
         request_mock.side_effect = requests.exceptions.ConnectionError()
 
         result = healthchecks.check_backend_api()
         self.assertDictContainsSubset({"status": "unhealthy", "response": "ConnectionError"}, result)
 
-    @mock.patch("requests.get")
+    @mock.patch("requests.Session.get")
     def test_backend_check_fails_if_backend_is_unhealthy(self, request_mock):
         request_mock.return_value.ok = False
         request_mock.return_value.json.return_value = {"status": "DOWN"}
@@ -51,7 +51,7 @@ class BackendAPIHealthcheckTest(FlaskAppTestCase):
         result = healthchecks.check_backend_api()
         self.assertDictContainsSubset({"status": "unhealthy", "response": {"status": "DOWN"}}, result)
 
-    @mock.patch("requests.get")
+    @mock.patch("requests.Session.get")
     def test_backend_check_passes_if_backend_is_healthy(self, request_mock):
         request_mock.return_value.ok = True
         request_mock.return_value.json.return_value = {"status": "UP"}
@@ -0,0 +1,75 @@
+import re
+
+import mock
+
+from cla_public.apps.base.tests import FlaskAppTestCase
+
+
+class PageCacheTest(FlaskAppTestCase):
+    def setUp(self):
+        super(PageCacheTest, self).setUp()
+        self.client = self.app.test_client()
+
+    def test_static_page_rendered_once_per_locale(self):
+        with mock.patch("cla_public.apps.base.views.render_template", return_value=u"privacy") as render:
+            self.client.get("/privacy")
+            self.client.get("/privacy")
+            self.assertEqual(1, render.call_count)
+
+            self.client.set_cookie("localhost", "locale", "cy_GB")
+            response = self.client.get("/privacy")
+            self.assertEqual(2, render.call_count)
+            self.assertEqual("privacy", response.data)
+
+    def test_conditional_get(self):
+        response = self.client.get("/accessibility-statement")
+        self.assertEqual(200, response.status_code)
+        etag = response.headers["ETag"]
+
+        response = self.client.get("/accessibility-statement", headers={"If-None-Match": etag})
+        self.assertEqual(304, response.status_code)
+        self.assertEqual("", response.data)
+
+    def test_quick_exit_rendered_separately(self):
+        quick_exit_enabled = re.compile(r'class="laa-flee-button-container\s+laa-flee-button-enabled')
+        response = self.client.get("/cookies")
+        self.assertNotRegexpMatches(response.data, quick_exit_enabled)
+
+        with self.client.session_transaction() as session:
+            session.checker["diagnosis_previous_choices"] = ["n43n3"]
+        response = self.client.get("/cookies")
+        self.assertRegexpMatches(response.data, quick_exit_enabled)
+
+    def test_flashed_messages_not_cached(self):
+        self.client.get("/online-safety")
+        with self.client.session_transaction() as session:
+            session["_flashes"] = [("message", u"Your session has ended")]
+        response = self.client.get("/online-safety")
+        self.assertIn("Your session has ended", response.data)
+
+        response = self.client.get("/online-safety")
+        self.assertNotIn("Your session has ended", response.data)
+
+    def test_error_page_cached(self):
+        with mock.patch("cla_public.app.render_template", return_value=u"not found") as render:
+            self.client.get("/does-not-exist")
+            response = self.client.get("/also-does-not-exist")
+            self.assertEqual(1, render.call_count)
+        self.assertEqual(404, response.status_code)
+        self.assertEqual("not found", response.data)
+        self.assertNotIn("ETag", response.headers)
+
+    def test_server_error_page_cached(self):
+        def fail():
+            raise RuntimeError("boom")
+
+        self.app.add_url_rule("/fail", "fail", fail)
+        self.app.config["PROPAGATE_EXCEPTIONS"] = False
+        with mock.patch.object(self.app, "log_exception"):
+            with mock.patch("cla_public.app.render_template", return_value=u"server error") as render:
+                self.client.get("/fail")
+                response = self.client.get("/fail")
+                self.assertEqual(1, render.call_count)
+        self.assertEqual(500, response.status_code)
+        self.assertEqual("server error", response.data)
+        self.assertNotIn("ETag", response.headers)
@@ -0,0 +1,37 @@
+import os
+import shutil
+import tempfile
+
+from mock import patch
+
+from cla_public.apps.base.tests import FlaskAppTestCase
+from cla_public.django_to_jinja import compile_templates, configure_template_cache
+
+
+class TemplateCacheTest(FlaskAppTestCase):
+    def setUp(self):
+        super(TemplateCacheTest, self).setUp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+
+    def cached_app(self):
+        app = self.create_flask_app()
+        app.config["TEMPLATE_CACHE_DIR"] = self.cache_dir
+        return configure_template_cache(app)
+
+    def test_compiled_templates_cached(self):
+        names = compile_templates(self.cached_app())
+        self.assertIn("checker/review.html", names)
+        self.assertEqual(len(names), len(os.listdir(self.cache_dir)))
+
+    def test_cold_app_loads_cached_bytecode(self):
+        compile_templates(self.cached_app())
+        app = self.cached_app()
+        with patch.object(app.jinja_env, "compile", wraps=app.jinja_env.compile) as compile:
+            app.jinja_env.get_template("checker/review.html")
+        self.assertFalse(compile.called)
+
+    def test_unwritable_cache_still_renders(self):
+        app = self.cached_app()
+        with patch("tempfile.mkstemp", side_effect=OSError):
+            self.assertTrue(app.jinja_env.get_template("checker/review.html"))
@@ -14,6 +14,7 @@ import cla_public.apps.base.filters  # noqa: F401
 import cla_public.apps.base.extensions  # noqa: F401
 from cla_public.apps.base import base, healthchecks
 from cla_public.apps.base.forms import FeedbackForm, ReasonsForContactingForm
+from cla_public.apps.base.page_cache import cache_page
 from cla_public.apps.checker.api import post_reasons_for_contacting
 from cla_public.libs import zendesk
 from cla_public.libs.views import AjaxOrNormalMixin, HasFormMixin
@@ -30,26 +31,31 @@ def index():
 
 
 @base.route("/cookies")
+@cache_page
 def cookies():
     return render_template("cookies.html")
 
 
 @base.route("/cookie-settings")
+@cache_page
 def cookie_settings():
     return render_template("cookie-settings.html")
 
 
 @base.route("/privacy")
+@cache_page
 def privacy():
     return render_template("privacy.html")
 
 
 @base.route("/online-safety")
+@cache_page
 def online_safety():
     return render_template("online-safety.html")
 
 
 @base.route("/accessibility-statement")
+@cache_page
 def accessibility():
     return render_template("accessibility-statement.html")
 
@@ -259,7 +265,11 @@ def ping():
 
 @base.route("/healthcheck.json")
 def healthcheck():
-    response = {"disk": healthchecks.check_disk(), "Backend API test": healthchecks.check_backend_api()}
+    response = {
+        "disk": healthchecks.check_disk(),
+        "Backend API test": healthchecks.check_backend_api(),
+        "cache": healthchecks.check_cache(),
+    }
     ok = all(item["status"] == healthchecks.HEALTHY for _key, item in response.iteritems())
     result = jsonify(response)
     result.status_code = 200 if ok else 503
@@ -267,5 +277,6 @@ def healthcheck():
 
 
 @base.route("/maintenance")
+@cache_page
 def maintenance_page():
     return render_template("maintenance.html")
@@ -10,7 +10,9 @@ import json
 
 from cla_common.constants import ELIGIBILITY_STATES
 from cla_public.apps.checker.constants import CATEGORIES
+from cla_public.apps.checker.payload_schema import Amount, Field, Money, Schema
 from cla_public.libs.api_proxy import on_timeout
+from cla_public.libs.http_session import get_http_session
 from cla_public.libs.utils import get_locale
 
 
@@ -33,6 +35,7 @@ def get_api_connection():
         current_app.config["BACKEND_API"]["url"],
         timeout=current_app.config["API_CLIENT_TIMEOUT"],
         extra_headers={"Accept-Language": get_locale()},
+        session=get_http_session(),
     )
 
 
@@ -40,70 +43,48 @@ def money_interval(amount, interval="per_month"):
     return {"per_interval_value": amount, "interval_period": interval}
 
 
+# Finances of one person, zero until the means test says otherwise
+FINANCES = Schema(
+    Money("income.earnings"),
+    Money("income.benefits"),
+    Money("income.tax_credits"),
+    Money("income.child_benefits"),
+    Money("income.other_income"),
+    Money("income.self_employment_drawings"),
+    Money("income.maintenance_received"),
+    Money("income.pension"),
+    Field("income.self_employed", default=False),
+    Amount("savings.credit_balance"),
+    Amount("savings.investment_balance"),
+    Amount("savings.asset_balance"),
+    Amount("savings.bank_balance"),
+    Money("deductions.income_tax"),
+    Money("deductions.mortgage"),
+    Money("deductions.childcare"),
+    Money("deductions.rent"),
+    Money("deductions.maintenance"),
+    Money("deductions.national_insurance"),
+    Amount("deductions.criminal_legalaid_contributions"),
+)
+
+ELIGIBILITY_CHECK_FINANCES = FINANCES.updated(Amount("income.total"), Amount("savings.total"))
+
+ELIGIBILITY_CHECK = Schema(
+    Field("dependants_young", default=0),
+    Field("dependants_old", default=0),
+    Field("on_passported_benefits", default=False),
+    Field("on_nass_benefits", default=False),
+    Field("specific_benefits", default=dict),
+)
+ELIGIBILITY_CHECK += ELIGIBILITY_CHECK_FINANCES.under("you")
+ELIGIBILITY_CHECK += ELIGIBILITY_CHECK_FINANCES.under("partner")
+
+
 def initialise_eligibility_check(check):
     """Initialize the eligibility check API payload so that we will avoid
     getting 'unknown' eligibility all the time
     """
-
-    def set_(dict_, path, value):
-        key, _, rest = path.partition(".")
-        if rest:
-            dict_[key] = dict_.get(key, {})
-            set_(dict_[key], rest, value)
-        else:
-            dict_[key] = dict_.get(key, value)
-
-    set_(check, "you.income.earnings", money_interval(0))
-    set_(check, "you.income.benefits", money_interval(0))
-    set_(check, "you.income.tax_credits", money_interval(0))
-    set_(check, "you.income.child_benefits", money_interval(0))
-    set_(check, "you.income.other_income", money_interval(0))
-    set_(check, "you.income.self_employment_drawings", money_interval(0))
-    set_(check, "you.income.maintenance_received", money_interval(0))
-    set_(check, "you.income.pension", money_interval(0))
-    set_(check, "you.income.total", 0)
-    set_(check, "you.income.self_employed", False)
-    set_(check, "you.savings.credit_balance", 0)
-    set_(check, "you.savings.investment_balance", 0)
-    set_(check, "you.savings.total", 0)
-    set_(check, "you.savings.asset_balance", 0)
-    set_(check, "you.savings.bank_balance", 0)
-    set_(check, "you.deductions.income_tax", money_interval(0))
-    set_(check, "you.deductions.mortgage", money_interval(0))
-    set_(check, "you.deductions.childcare", money_interval(0))
-    set_(check, "you.deductions.rent", money_interval(0))
-    set_(check, "you.deductions.maintenance", money_interval(0))
-    set_(check, "you.deductions.national_insurance", money_interval(0))
-    set_(check, "you.deductions.criminal_legalaid_contributions", 0)
-    set_(check, "partner.income.earnings", money_interval(0))
-    set_(check, "partner.income.benefits", money_interval(0))
-    set_(check, "partner.income.tax_credits", money_interval(0))
-    set_(check, "partner.income.child_benefits", money_interval(0))
-    set_(check, "partner.income.other_income", money_interval(0))
-    set_(check, "partner.income.self_employment_drawings", money_interval(0))
-    set_(check, "partner.income.maintenance_received", money_interval(0))
-    set_(check, "partner.income.pension", money_interval(0))
-    set_(check, "partner.income.total", 0)
-    set_(check, "partner.income.self_employed", False)
-    set_(check, "partner.savings.credit_balance", 0)
-    set_(check, "partner.savings.investment_balance", 0)
-    set_(check, "partner.savings.total", 0)
-    set_(check, "partner.savings.asset_balance", 0)
-    set_(check, "partner.savings.bank_balance", 0)
-    set_(check, "partner.deductions.income_tax", money_interval(0))
-    set_(check, "partner.deductions.mortgage", money_interval(0))
-    set_(check, "partner.deductions.childcare", money_interval(0))
-    set_(check, "partner.deductions.rent", money_interval(0))
-    set_(check, "partner.deductions.maintenance", money_interval(0))
-    set_(check, "partner.deductions.national_insurance", money_interval(0))
-    set_(check, "partner.deductions.criminal_legalaid_contributions", 0)
-    set_(check, "dependants_young", 0)
-    set_(check, "dependants_old", 0)
-    set_(check, "on_passported_benefits", False)
-    set_(check, "on_nass_benefits", False)
-    set_(check, "specific_benefits", {})
-
-    return check
+    return ELIGIBILITY_CHECK.fill_defaults(check)
 
 
 API_MESSAGE_WARNINGS = ["Case with this Eligibility check already exists."]
@@ -1,26 +1,115 @@
 import os
 import re
+import threading
+import time
 import uuid
 
 from flask import current_app, request
 import requests
-from requests.exceptions import ConnectionError, Timeout
+
+from cla_public.libs import counters
+
+
+CONFIG_CACHE_KEY = "cait_config_entry"
+CONFIG_CACHE_TIMEOUT = 7 * 24 * 60 * 60
+DEFAULT_REFRESH_INTERVAL = 5 * 60
+# fetches made while a request waits keep the old 1s timeout
+FETCH_TIMEOUT = 1
+BACKGROUND_FETCH_TIMEOUT = 5
+
+_refresh_lock = threading.Lock()
 
 
 class ConfigException(Exception):
     pass
 
 
-def get_config():
+def fetch_config(cached=None, timeout=FETCH_TIMEOUT):
+    """
+    Fetch the config from GitHub, revalidating the `cached` entry if there is
+    one. Returns a new cache entry or None if the config could not be fetched.
+    """
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+
+    try:
+        response = requests.get(grt_config_url(), headers=headers, timeout=timeout, verify=False)
+        if cached and response.status_code == 304:
+            config = cached["config"]
+        elif response.status_code == 200:
+            config = response.json()
+        else:
+            # eg. GitHub's rate limit or not found messages, which are JSON too
+            return None
+    except (requests.RequestException, ValueError):
+        return None
+
+    return {
+        "config": config,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "fetched_at": time.time(),
+    }
+
+
+def refresh_config(timeout=FETCH_TIMEOUT):
+    """
+    Fetch the config in to the cache. A failure keeps the last good copy, or
+    with none records that there is no config, and either way waits a full
+    interval before trying again.
+    """
+    cached = current_app.cache.get(CONFIG_CACHE_KEY)
+    entry = fetch_config(cached, timeout)
+    if entry is None:
+        entry = dict(cached or {"config": None, "etag": None, "last_modified": None}, fetched_at=time.time())
+    current_app.cache.set(CONFIG_CACHE_KEY, entry, timeout=CONFIG_CACHE_TIMEOUT)
+    return entry
+
+
+def refresh_in_background():
+    if not _refresh_lock.acquire(False):
+        return
+    app = current_app._get_current_object()
+
+    def refresh():
+        try:
+            with app.app_context():
+                refresh_config(BACKGROUND_FETCH_TIMEOUT)
+        finally:
+            _refresh_lock.release()
+
+    thread = threading.Thread(target=refresh)
+    thread.daemon = True
+    started = False
     try:
-        cait_intervention_config = requests.get(grt_config_url(), timeout=1, verify=False).json()
-        current_app.cache.set("cait_config", cait_intervention_config)
-        return cait_intervention_config
-    except (ConnectionError, Timeout, ValueError):
-        cached_config = current_app.cache.get("cait_config")
-        if cached_config:
-            return cached_config
+        thread.start()
+        started = True
+    finally:
+        # the thread releases the lock once it has run
+        if not started:
+            _refresh_lock.release()
+
+
+def get_config():
+    """
+    The last fetched config, refreshed in the background once it is older
+    than CAIT_CONFIG_REFRESH_INTERVAL seconds. Raises ConfigException while
+    there is no config yet, so a worker with nothing cached renders without
+    CAIT until its first fetch lands.
+    """
+    entry = current_app.cache.get(CONFIG_CACHE_KEY)
+    interval = current_app.config.get("CAIT_CONFIG_REFRESH_INTERVAL", DEFAULT_REFRESH_INTERVAL)
+    if entry is None or time.time() - entry["fetched_at"] > interval:
+        if current_app.config.get("CAIT_CONFIG_BACKGROUND_REFRESH", True):
+            refresh_in_background()
+        else:
+            entry = refresh_config()
+    if not entry or entry["config"] is None:
         raise ConfigException("Could not get config")
+    return entry["config"]
 
 
 def grt_config_url():
@@ -35,12 +124,9 @@ def grt_config_url():
 
 
 def get_counter(increment=0):
-    key = "cait_counter"
-    count = current_app.cache.get(key) or 0
     if increment:
-        count += increment
-        current_app.cache.set(key, count)
-    return count
+        return counters.incr("cait_counter", increment)
+    return counters.get("cait_counter")
 
 
 def get_uuid():
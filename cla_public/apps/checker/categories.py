@@ -0,0 +1,79 @@
+# coding: utf-8
+"Categories looked up by id, English name or slug"
+
+from babel import support
+from speaklater import _LazyString
+
+from cla_public.apps.checker.constants import CATEGORIES, ORGANISATION_CATEGORY_MAPPING
+
+
+def untranslated(text):
+    """
+    The English text of a lazy_gettext string
+    """
+    if isinstance(text, _LazyString):
+        return text._args[0]
+    return text
+
+
+def slugify(name):
+    return name.lower().replace(" ", "-")
+
+
+class Category(object):
+    """
+    A category from CATEGORIES with the English strings used for lookups
+    worked out up front
+    """
+
+    def __init__(self, category_id, label, description):
+        self.id = category_id
+        self.label = label
+        self.description = description
+        self.name = untranslated(label)
+        self.slug = slugify(self.name)
+        # knowledge base categories are in English
+        self.organisation_name = ORGANISATION_CATEGORY_MAPPING.get(self.name, self.name)
+        self.names = {}
+
+    @property
+    def option(self):
+        return self.id, self.label, self.description
+
+    def translated_name(self, locale):
+        return self.names.get(locale, self.label)
+
+
+class CategoryRegistry(object):
+    """
+    Categories indexed by id, English name and slug, so lookups need neither
+    a scan of CATEGORIES nor a switch to the English locale
+    """
+
+    def __init__(self, categories):
+        self.categories = [Category(*category) for category in categories]
+        self.by_id = {category.id: category for category in self.categories}
+        self.by_name = {category.name: category for category in self.categories}
+        self.by_slug = {category.slug: category for category in self.categories}
+
+    def translate(self, dirname, locales):
+        """
+        Translate the category names in to each of `locales` with the
+        catalogues in `dirname`
+        """
+        for locale in locales:
+            translations = support.Translations.load(dirname, [locale])
+            for category in self.categories:
+                category.names[locale] = translations.ugettext(category.name)
+
+    def get(self, category_id):
+        return self.by_id.get(category_id)
+
+    def from_name(self, name):
+        return self.by_name.get(name)
+
+    def from_slug(self, slug):
+        return self.by_slug.get(slugify(slug))
+
+
+category_registry = CategoryRegistry(CATEGORIES)
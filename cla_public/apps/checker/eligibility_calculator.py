@@ -0,0 +1,213 @@
+# coding: utf-8
+"In-process shadow of the backend eligibility calculation"
+
+import logging
+
+from cla_common.constants import ELIGIBILITY_STATES
+
+from cla_public.apps.checker.constants import YES
+from cla_public.libs import metrics
+from cla_public.libs.money_interval import MoneyInterval
+
+
+log = logging.getLogger(__name__)
+
+# Amounts in pence per month. The backend holds the authoritative values;
+# these only need to be close enough to spot obvious outcomes.
+DEFAULT_THRESHOLDS = {
+    "gross_income_limit": 265700,
+    "gross_income_dependant_supplement": 22200,
+    "gross_income_free_dependants": 4,
+    "disposable_income_limit": 73300,
+    "capital_limit": 800000,
+    "main_home_equity_disregard": 10000000,
+    "disputed_property_disregard": 10000000,
+    "pensioner_capital_disregard": 10000000,
+    "employment_allowance": 4500,
+    "partner_allowance": 18191,
+    "dependant_allowance": 29665,
+}
+
+PEOPLE = ("you", "partner")
+
+INCOME_FIELDS = (
+    "earnings",
+    "self_employment_drawings",
+    "benefits",
+    "tax_credits",
+    "child_benefits",
+    "maintenance_received",
+    "pension",
+    "other_income",
+)
+
+DEDUCTION_FIELDS = ("income_tax", "national_insurance", "maintenance", "childcare", "rent", "mortgage")
+
+SAVINGS_FIELDS = ("bank_balance", "investment_balance", "asset_balance", "credit_balance")
+
+
+class Bound(object):
+    """
+    Running total of amounts which tracks whether any of them were unknown.
+    Amounts are never negative, so an incomplete total is a lower bound.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.complete = True
+
+    def add(self, amount):
+        if amount is None:
+            self.complete = False
+        else:
+            self.total += amount
+        return self
+
+    def add_monthly(self, value):
+        if value is None:
+            return self.add(None)
+        interval = MoneyInterval(value)
+        if interval.amount is None or not interval.interval:
+            return self.add(None)
+        return self.add(interval.per_month().amount)
+
+
+class ShadowEligibilityCalculator(object):
+    """
+    Evaluates a means test payload against configurable thresholds.
+
+    Only returns a result when the outcome is obvious from the data entered so
+    far, otherwise returns None so callers defer to the backend.
+    """
+
+    def __init__(self, payload, thresholds=None):
+        self.payload = payload
+        self.thresholds = dict(DEFAULT_THRESHOLDS)
+        self.thresholds.update(thresholds or {})
+
+    def people(self):
+        return [self.payload[person] for person in PEOPLE if person in self.payload]
+
+    @property
+    def is_passported(self):
+        return self.payload.get("on_passported_benefits") in (YES, True)
+
+    @property
+    def dependants(self):
+        return (self.payload.get("dependants_young") or 0) + (self.payload.get("dependants_old") or 0)
+
+    def gross_income(self):
+        bound = Bound()
+        for person in self.people():
+            income = person.get("income", {})
+            for field in INCOME_FIELDS:
+                if field in income:
+                    bound.add_monthly(income[field])
+        return bound
+
+    def gross_income_limit(self):
+        extra_dependants = max(0, self.dependants - self.thresholds["gross_income_free_dependants"])
+        supplement = extra_dependants * self.thresholds["gross_income_dependant_supplement"]
+        return self.thresholds["gross_income_limit"] + supplement
+
+    def allowances(self):
+        allowances = self.dependants * self.thresholds["dependant_allowance"]
+        if "partner" in self.payload:
+            allowances += self.thresholds["partner_allowance"]
+        for person in self.people():
+            income = person.get("income", {})
+            if MoneyInterval(income.get("earnings") or 0).amount or income.get("self_employed") in (YES, True):
+                allowances += self.thresholds["employment_allowance"]
+        return allowances
+
+    def disposable_income(self):
+        gross = self.gross_income()
+        deductions = Bound()
+        for person in self.people():
+            person_deductions = person.get("deductions", {})
+            for field in DEDUCTION_FIELDS:
+                if field in person_deductions:
+                    deductions.add_monthly(person_deductions[field])
+            deductions.add(person_deductions.get("criminal_legalaid_contributions") or 0)
+
+        disposable = Bound()
+        disposable.complete = gross.complete and deductions.complete
+        disposable.total = gross.total - deductions.total - self.allowances()
+        return disposable
+
+    def property_capital(self, prop):
+        """
+        Lower bound of the assessed equity of a property: an unknown share
+        contributes nothing and every applicable disregard is applied in full
+        """
+        value, mortgage, share = prop.get("value"), prop.get("mortgage_left"), prop.get("share")
+        if value is None or share is None:
+            return None
+        equity = value * share // 100 - (mortgage or 0)
+        if prop.get("main") in (YES, True):
+            equity -= self.thresholds["main_home_equity_disregard"]
+        if prop.get("disputed") in (YES, True):
+            equity -= self.thresholds["disputed_property_disregard"]
+        return max(0, equity)
+
+    def capital(self):
+        bound = Bound()
+        for person in self.people():
+            savings = person.get("savings", {})
+            for field in SAVINGS_FIELDS:
+                if field in savings:
+                    bound.add(savings[field])
+        for prop in self.payload.get("property_set", []):
+            bound.add(self.property_capital(prop))
+        return bound
+
+    def capital_limit(self):
+        limit = self.thresholds["capital_limit"]
+        if self.payload.get("is_you_or_your_partner_over_60") in (YES, True):
+            limit += self.thresholds["pensioner_capital_disregard"]
+        return limit
+
+    def is_eligible(self):
+        capital = self.capital()
+        if capital.total > self.capital_limit():
+            return ELIGIBILITY_STATES.NO
+
+        if self.is_passported:
+            return None
+
+        gross = self.gross_income()
+        if gross.total > self.gross_income_limit():
+            return ELIGIBILITY_STATES.NO
+
+        disposable = self.disposable_income()
+        if disposable.complete and disposable.total > self.thresholds["disposable_income_limit"]:
+            return ELIGIBILITY_STATES.NO
+
+        # Income at or under the disposable limit passes whatever is deducted.
+        # Property is left to the backend as mortgage and disputed property
+        # disregards are capped across all properties.
+        if not (capital.complete and gross.complete) or self.payload.get("property_set"):
+            return None
+        capital_ok = capital.total <= self.thresholds["capital_limit"]
+        if capital_ok and gross.total <= self.thresholds["disposable_income_limit"]:
+            return ELIGIBILITY_STATES.YES
+
+        return None
+
+
+def compare_with_backend(shadow_result, backend_result, reference=None):
+    """
+    Log when the shadow calculation disagrees with the backend
+    """
+    if shadow_result is None or backend_result not in (ELIGIBILITY_STATES.YES, ELIGIBILITY_STATES.NO):
+        return
+    if shadow_result == backend_result:
+        metrics.incr("shadow_eligibility.agreed")
+        return
+    metrics.incr("shadow_eligibility.disagreed")
+    log.warning(
+        "Shadow eligibility calculation disagrees with backend for %s: shadow=%s backend=%s",
+        reference,
+        shadow_result,
+        backend_result,
+    )
@@ -25,6 +25,7 @@ from cla_public.apps.checker.fields import (
     SetZeroIntegerField,
     SetZeroFormField,
 )
+from cla_public.libs.field_plan import FieldPlanMixin
 from cla_public.libs.honeypot import Honeypot
 from cla_public.apps.checker.utils import money_intervals_except, money_intervals
 from cla_public.apps.checker.validators import (
@@ -46,7 +47,7 @@ class BaseForm(BabelTranslationsFormMixin, Honeypot, Form):
     pass
 
 
-class BaseNoCsrfForm(BabelTranslationsFormMixin, NoCsrfForm):
+class BaseNoCsrfForm(BabelTranslationsFormMixin, FieldPlanMixin, NoCsrfForm):
     pass
 
 
@@ -214,13 +215,17 @@ class YourBenefitsForm(BaseForm):
     def get_non_income_benefits(cls):
         return sorted([unicode(benefit[1]) for benefit in NON_INCOME_BENEFITS])
 
+    def skipped_fields(self):
+        # remove child benefit option if has no children/dependents
+        if not (session.checker.has_children or session.checker.has_dependants):
+            return ["child_benefit"]
+        return []
+
     def __init__(self, *args, **kwargs):
         super(YourBenefitsForm, self).__init__(*args, **kwargs)
 
-        # remove child benefit option if has no children/dependents
-        if not (session.checker.has_children or session.checker.has_dependants):
+        if self.child_benefit is None:
             self.benefits.choices = filter(lambda benefit: benefit[0] != "child_benefit", self.benefits.choices)
-            del self.child_benefit
 
         # sort benefits by label
         self.benefits.choices = (
@@ -390,30 +395,30 @@ class SavingsForm(BaseForm):
         ],
     )
 
-    def __init__(self, *args, **kwargs):
-        super(SavingsForm, self).__init__(*args, **kwargs)
-
+    def skipped_fields(self):
+        skipped = []
         if not session.checker.has_valuables:
-            del self.valuables
+            skipped.append("valuables")
 
         if not session.checker.has_savings:
-            del self.savings
-            del self.investments
+            skipped.extend(["savings", "investments"])
+        return skipped
 
 
 class IncomeFieldForm(BaseNoCsrfForm):
-    def __init__(self, *args, **kwargs):
-        self.is_partner = kwargs.pop("is_partner", False)
-        super(IncomeFieldForm, self).__init__(*args, **kwargs)
+    def skipped_fields(self):
+        skipped = []
         if (not (session.checker.is_employed or session.checker.is_self_employed) and not self.is_partner) or (
             not (session.checker.partner_is_employed or session.checker.partner_is_self_employed) and self.is_partner
         ):
-            del self.earnings
-            del self.income_tax
-            del self.national_insurance
-            del self.working_tax_credit
+            skipped.extend(["earnings", "income_tax", "national_insurance", "working_tax_credit"])
         if self.is_partner or not (session.checker.has_children or session.checker.has_dependants):
-            del self.child_tax_credit
+            skipped.append("child_tax_credit")
+        return skipped
+
+    def __init__(self, *args, **kwargs):
+        self.is_partner = kwargs.pop("is_partner", False)
+        super(IncomeFieldForm, self).__init__(*args, **kwargs)
 
         self_employed_fields = [field for field in self if isinstance(field, SelfEmployedMoneyIntervalField)]
         for field in self_employed_fields:
@@ -608,11 +613,11 @@ class IncomeForm(BaseForm):
     your_income = IncomeField(label=_(u"Your personal income"))
     partner_income = IncomeField(form_kwargs={"is_partner": True}, label=_(u"Your partner’s income"))
 
-    def __init__(self, *args, **kwargs):
+    def skipped_fields(self):
         """Dynamically remove partner subform if user has no partner"""
-        super(IncomeForm, self).__init__(*args, **kwargs)
         if not session.checker.has_partner:
-            del self.partner_income
+            return ["partner_income"]
+        return []
 
 
 class OutgoingsForm(BaseForm):
@@ -688,10 +693,10 @@ class OutgoingsForm(BaseForm):
         ],
     )
 
-    def __init__(self, *args, **kwargs):
-        super(OutgoingsForm, self).__init__(*args, **kwargs)
+    def skipped_fields(self):
         if not session.checker.has_children and not session.checker.has_dependants:
-            del self.childcare
+            return ["childcare"]
+        return []
 
 
 class ReviewForm(BaseForm):
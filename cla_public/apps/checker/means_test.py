@@ -3,51 +3,145 @@
 
 from collections import Mapping
 from copy import deepcopy
+import hashlib
 import logging
 import sys
 
-from flask import current_app, session
+from flask import current_app, json, session
 from slumber.exceptions import SlumberBaseException
 from requests.exceptions import ConnectionError, Timeout
 
-from cla_public.apps.checker.api import get_api_connection
+from cla_public.apps.checker.api import FINANCES as CHECK_FINANCES, get_api_connection
 from cla_public.apps.checker.constants import YES, NO, PASSPORTED_BENEFITS, CATEGORY_ID_MAPPING
+from cla_public.apps.checker.payload_schema import Amount, Field, Money, Schema
 from cla_public.apps.checker.utils import nass, passported
-from cla_public.libs.money_interval import MoneyInterval, to_amount
+from cla_public.libs.money_interval import MoneyInterval, sum_per_month
+from cla_public.libs.ttl_cache import app_cache
 from cla_public.libs.utils import classproperty, flatten
 
 
 log = logging.getLogger(__name__)
 
+# Session key holding digests of the last payload saved to the backend
+SAVED_DIGESTS_KEY = "means_test_saved"
+
+DIGEST_LENGTH = 12
+
+# Forms saved in the means test, in the order their payloads are merged
+PAYLOAD_FORMS = (
+    "AboutYouForm",
+    "YourBenefitsForm",
+    "AdditionalBenefitsForm",
+    "PropertiesForm",
+    "SavingsForm",
+    "IncomeForm",
+    "OutgoingsForm",
+)
+
+# Other forms in the session each form's payload reads
+PAYLOAD_DEPENDENCIES = {
+    "AboutYouForm": ("PropertiesForm",),
+    "PropertiesForm": ("AboutYouForm",),
+    "SavingsForm": ("AboutYouForm",),
+    "IncomeForm": ("AboutYouForm", "PropertiesForm"),
+    "OutgoingsForm": ("AboutYouForm",),
+}
+
+DEFAULT_FRAGMENT_CACHE = {"maxsize": 2048, "ttl": 30 * 60}
+
+# Finances of one person before any form is answered
+FINANCES = CHECK_FINANCES.updated(Field("income.self_employed", default=NO))
+
+MEANS_TEST = FINANCES.under("you") + Schema(
+    Field("dependants_young", default=0),
+    Field("dependants_old", default=0),
+    Field("on_passported_benefits", default=NO),
+    Field("on_nass_benefits", default=NO),
+    Field("specific_benefits", default=dict),
+)
+
+
+def payload_digest(value):
+    """
+    Short, stable digest of a JSON-serialisable payload fragment
+    """
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=unicode)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()[:DIGEST_LENGTH]
+
+
+def saved_payload_digest():
+    """
+    Digest of the whole payload last saved to the backend, or None if the
+    current eligibility check has not been saved from the means test yet
+    """
+    saved = session.checker.get(SAVED_DIGESTS_KEY) or {}
+    if not saved or saved.get("ref") != session.checker.get("eligibility_check"):
+        return None
+    return payload_digest(saved.get("d", {}))
+
+
+def fragment_cache():
+    config = dict(DEFAULT_FRAGMENT_CACHE)
+    config.update(current_app.config.get("PAYLOAD_FRAGMENT_CACHE", {}))
+    return app_cache("payload_fragment_cache", config["maxsize"], config["ttl"])
+
+
+def form_digest(form):
+    """
+    Digest of the session data of `form`, worked out once until the checker
+    data changes. Keys are not sorted, which is faster and at worst misses
+    the cache.
+    """
 
-def mi(field, val):
-    amount = "%s-per_interval_value" % field
-    period = "%s-interval_period" % field
-    return {"per_interval_value": val(amount), "interval_period": val(period)}
+    def digest():
+        encoded = json.dumps(session.checker.get(form), sort_keys=False, separators=(",", ":"), default=unicode)
+        return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+    return session.checker.memoized(("form_digest", form), digest)
+
+
+def fragment_key(form):
+    forms = (form,) + PAYLOAD_DEPENDENCIES.get(form, ())
+    return "{0}:{1}".format(form, ":".join(form_digest(name) for name in forms))
+
+
+def copied(val):
+    "Value for a key missing from the payload being updated"
+    if isinstance(val, (Mapping, list)):
+        return deepcopy(val)
+    return val
+
+
+def merged_mapping(current, val):
+    "Value for a key whose new value `val` is a mapping"
+    if isinstance(val, MoneyInterval):
+        return val
+    if MoneyInterval.is_money_interval(val):
+        return MoneyInterval(val)
+    if val == {}:
+        return current
+    if not isinstance(current, Mapping):
+        current = {}
+    return recursive_update(current, val)
 
 
 def recursive_update(orig, other):
     for key, val in other.iteritems():
 
         if key not in orig:
-            if isinstance(val, Mapping):
-                orig[key] = deepcopy(val)
-            else:
-                orig[key] = val
+            orig[key] = copied(val)
 
         elif orig[key] == val:
             continue
 
-        elif key == "notes" and orig[key] != val:
+        elif key == "notes":
             orig[key] = "{0}\n\n{1}".format(orig[key], val)
 
         elif isinstance(val, Mapping):
-            if MoneyInterval.is_money_interval(val):
-                orig[key] = MoneyInterval(val)
-            elif val != {}:
-                if not isinstance(orig[key], Mapping):
-                    orig[key] = {}
-                orig[key] = recursive_update(orig[key], val)
+            orig[key] = merged_mapping(orig[key], val)
+
+        elif isinstance(val, list):
+            orig[key] = deepcopy(val)
         else:
             orig[key] = val
 
@@ -95,6 +189,8 @@ class AboutYouPayload(dict):
 
 
 class YourBenefitsPayload(dict):
+    schema = Schema(Money("you.income.child_benefits", "child_benefit"))
+
     @classproperty
     def default(cls):
         return {"specific_benefits": {}, "on_passported_benefits": NO}
@@ -114,37 +210,22 @@ class YourBenefitsPayload(dict):
             payload = recursive_update(payload, IncomePayload.default)
             payload = recursive_update(payload, OutgoingsPayload.default)
         else:
-
-            def val(field):
-                return form_data.get(field)
-
-            payload["you"] = {"income": {"child_benefits": MoneyInterval(mi("child_benefit", val))}}
+            payload.update(self.schema.build(form_data))
 
         self.update(payload)
 
 
 class AdditionalBenefitsPayload(dict):
+    schema = Schema(Money("you.income.benefits", "total_other_benefit"))
+
     def __init__(self, form_data={}):
         super(AdditionalBenefitsPayload, self).__init__()
 
-        def val(field):
-            return form_data.get(field)
-
-        def yes(field):
-            return form_data[field] == YES
-
-        benefits = val("benefits")
+        benefits = form_data.get("benefits")
+        skip = () if form_data["other_benefits"] == YES else ("total_other_benefit",)
 
-        payload = {
-            "on_nass_benefits": nass(benefits),  # always False
-            "you": {
-                "income": {
-                    "benefits": MoneyInterval(mi("total_other_benefit", val))
-                    if yes("other_benefits")
-                    else MoneyInterval(0)
-                }
-            },
-        }
+        payload = self.schema.build(form_data, skip=skip)
+        payload["on_nass_benefits"] = nass(benefits)  # always False
 
         if benefits:
             payload["notes"] = u"Other benefits:\n - {0}".format("\n - ".join(benefits))
@@ -153,28 +234,21 @@ class AdditionalBenefitsPayload(dict):
 
 
 class PropertyPayload(dict):
+    schema = Schema(
+        Amount("value", "property_value"),
+        Amount("mortgage_left", "mortgage_remaining"),
+        Field("disputed", "in_dispute"),
+        Money("rent", "rent_amount"),
+        Field("main", "is_main_home"),
+    )
+
     def __init__(self, form_data={}):
         super(PropertyPayload, self).__init__()
 
-        def val(field):
-            return form_data.get(field)
+        skip = () if form_data.get("is_rented") == YES else ("rent_amount",)
 
-        def yes(field):
-            return form_data.get(field) == YES
-
-        def no(field):
-            return form_data.get(field) == NO
-
-        self.update(
-            {
-                "value": to_amount(val("property_value")),
-                "mortgage_left": to_amount(val("mortgage_remaining")),
-                "share": 100 if no("other_shareholders") else None,
-                "disputed": val("in_dispute"),
-                "rent": MoneyInterval(mi("rent_amount", val)) if yes("is_rented") else MoneyInterval(0),
-                "main": val("is_main_home"),
-            }
-        )
+        self.update(self.schema.build(form_data, skip=skip))
+        self["share"] = 100 if form_data.get("other_shareholders") == NO else None
 
 
 class PropertiesPayload(dict):
@@ -203,9 +277,9 @@ class PropertiesPayload(dict):
         def mortgage(index):
             return MoneyInterval(form_data.get("properties-%d-mortgage_payments" % index, 0))
 
-        total_mortgage = sum(map(mortgage, range(len(properties))))
+        total_mortgage = sum_per_month(map(mortgage, range(len(properties))))
 
-        total_rent = sum(p["rent"] for p in properties)
+        total_rent = sum_per_month(p["rent"] for p in properties)
 
         self.update(
             {
@@ -216,53 +290,45 @@ class PropertiesPayload(dict):
 
 
 class SavingsPayload(dict):
+    schema = Schema(
+        Amount("you.savings.bank_balance", "savings"),
+        Amount("you.savings.investment_balance", "investments"),
+        Amount("you.savings.asset_balance", "valuables"),
+    )
+
     @classproperty
     def default(cls):
-        return {"you": {"savings": {"bank_balance": 0, "investment_balance": 0, "asset_balance": 0}}}
+        return cls.schema.defaults()
 
     def __init__(self, form_data={}):
         super(SavingsPayload, self).__init__()
 
-        def val(field):
-            return form_data.get(field)
+        skip = []
+        if not session.checker.has_savings:
+            skip.extend(["savings", "investments"])
+        if not session.checker.has_valuables:
+            skip.append("valuables")
 
-        savings = 0
-        investments = 0
-        valuables = 0
-
-        if session.checker.has_savings:
-            savings = val("savings")
-            investments = val("investments")
-        if session.checker.has_valuables:
-            valuables = val("valuables")
-
-        self.update(
-            {
-                "you": {
-                    "savings": {
-                        "bank_balance": to_amount(savings),
-                        "investment_balance": to_amount(investments),
-                        "asset_balance": to_amount(valuables),
-                    }
-                }
-            }
-        )
+        self.update(self.schema.build(form_data, skip=skip))
 
 
 class IncomePayload(dict):
-    @staticmethod
-    def income():
-        return {
-            "income": {
-                "earnings": MoneyInterval(0),
-                "tax_credits": MoneyInterval(0),
-                "other_income": MoneyInterval(0),
-                "self_employment_drawings": MoneyInterval(0),
-                "maintenance_received": MoneyInterval(0),
-                "pension": MoneyInterval(0),
-            },
-            "deductions": {"income_tax": MoneyInterval(0), "national_insurance": MoneyInterval(0)},
-        }
+    schema = Schema(
+        Money("income.earnings", "earnings"),
+        Money("income.self_employment_drawings"),
+        Money("income.tax_credits", "working_tax_credit"),
+        Money("income.maintenance_received", "maintenance"),
+        Money("income.pension", "pension"),
+        Money("income.other_income", "other_income"),
+        Money("deductions.income_tax", "income_tax"),
+        Money("deductions.national_insurance", "national_insurance"),
+    )
+
+    child_tax_credit = staticmethod(Money("income.tax_credits", "child_tax_credit").reader("your_income-"))
+
+    @classmethod
+    def income(cls):
+        return cls.schema.defaults()
 
     @classproperty
     def default(self):
@@ -271,34 +337,14 @@ class IncomePayload(dict):
     def __init__(self, form_data={}):
         super(IncomePayload, self).__init__()
 
-        def income(person, prefix_, self_employed=False, employed=False):
-            def prefix(field):
-                return "{0}-{1}".format(prefix_, field)
-
-            def val(field):
-                return form_data.get(prefix(field))
-
-            child_tax_credit = MoneyInterval(mi("child_tax_credit", val)) if person == "you" else MoneyInterval(0)
-            payload = {
-                person: {
-                    "income": {
-                        "earnings": MoneyInterval(mi("earnings", val)),
-                        "self_employment_drawings": MoneyInterval(0),
-                        "tax_credits": MoneyInterval(mi("working_tax_credit", val)) + child_tax_credit,
-                        "maintenance_received": MoneyInterval(mi("maintenance", val)),
-                        "pension": MoneyInterval(mi("pension", val)),
-                        "other_income": MoneyInterval(mi("other_income", val)),
-                    },
-                    "deductions": {
-                        "income_tax": MoneyInterval(mi("income_tax", val)),
-                        "national_insurance": MoneyInterval(mi("national_insurance", val)),
-                    },
-                }
-            }
+        def income(person, prefix, self_employed=False, employed=False):
+            child_tax_credit = self.child_tax_credit(form_data) if person == "you" else MoneyInterval(0)
+            payload = {person: self.schema.build(form_data, "{0}-".format(prefix))}
+            payload[person]["income"]["tax_credits"] += child_tax_credit
 
             if self_employed:
+                payload[person]["income"]["self_employment_drawings"] = payload[person]["income"]["earnings"]
                 payload[person]["income"]["earnings"] = MoneyInterval(0)
-                payload[person]["income"]["self_employment_drawings"] = MoneyInterval(mi("earnings", val))
 
             if not employed:
                 payload[person]["income"]["earnings"] = MoneyInterval(0)
@@ -317,11 +363,8 @@ class IncomePayload(dict):
         )
 
         if session.checker.owns_property:
-            rents = [
-                MoneyInterval(p["rent_amount"])
-                for p in session.checker.get("PropertiesForm", {}).get("properties", [])
-            ]
-            total_rent = sum(rents)
+            properties = session.checker.get("PropertiesForm", {}).get("properties", [])
+            total_rent = sum_per_month(MoneyInterval(p["rent_amount"]) for p in properties)
             payload["you"]["income"]["other_income"] += total_rent
 
         if session.checker.has_partner:
@@ -337,39 +380,25 @@ class IncomePayload(dict):
 
 
 class OutgoingsPayload(dict):
+    schema = Schema(
+        Money("you.deductions.rent", "rent"),
+        Money("you.deductions.maintenance", "maintenance"),
+        Money("you.deductions.childcare", "childcare"),
+        Amount("you.deductions.criminal_legalaid_contributions", "income_contribution"),
+    )
+
     @classproperty
     def default(cls):
-        return {
-            "you": {
-                "deductions": {
-                    "rent": MoneyInterval(0),
-                    "maintenance": MoneyInterval(0),
-                    "childcare": MoneyInterval(0),
-                    "criminal_legalaid_contributions": 0,
-                }
-            }
-        }
+        return cls.schema.defaults()
 
     def __init__(self, form_data={}):
         super(OutgoingsPayload, self).__init__()
 
-        def val(field):
-            return form_data.get(field)
-
-        self.update(
-            {
-                "you": {
-                    "deductions": {
-                        "rent": MoneyInterval(mi("rent", val)),
-                        "maintenance": MoneyInterval(mi("maintenance", val)),
-                        "criminal_legalaid_contributions": to_amount(val("income_contribution")),
-                        "childcare": MoneyInterval(mi("childcare", val)),
-                    }
-                }
-            }
-        )
+        skip = ()
         if not session.checker.has_children and not session.checker.has_dependants:
-            self["you"]["deductions"]["childcare"] = MoneyInterval(0)
+            skip = ("childcare",)
+
+        self.update(self.schema.build(form_data, skip=skip))
 
 
 class MeansTestError(Exception):
@@ -386,44 +415,15 @@ class MeansTest(dict):
 
         self.reference = session.checker.get("eligibility_check", None)
 
-        def zero_finances():
-            return {
-                "income": {
-                    "earnings": MoneyInterval(0),
-                    "benefits": MoneyInterval(0),
-                    "tax_credits": MoneyInterval(0),
-                    "child_benefits": MoneyInterval(0),
-                    "other_income": MoneyInterval(0),
-                    "self_employment_drawings": MoneyInterval(0),
-                    "maintenance_received": MoneyInterval(0),
-                    "pension": MoneyInterval(0),
-                    "self_employed": NO,
-                },
-                "savings": {"credit_balance": 0, "investment_balance": 0, "asset_balance": 0, "bank_balance": 0},
-                "deductions": {
-                    "income_tax": MoneyInterval(0),
-                    "mortgage": MoneyInterval(0),
-                    "childcare": MoneyInterval(0),
-                    "rent": MoneyInterval(0),
-                    "maintenance": MoneyInterval(0),
-                    "national_insurance": MoneyInterval(0),
-                    "criminal_legalaid_contributions": 0,
-                },
-            }
-
-        self.update(
-            {
-                "you": zero_finances(),
-                "dependants_young": 0,
-                "dependants_old": 0,
-                "on_passported_benefits": NO,
-                "on_nass_benefits": NO,
-                "specific_benefits": {},
-            }
-        )
-
+        defaults = MEANS_TEST.defaults()
         if session.checker.has_partner:
-            self.update({"partner": zero_finances()})
+            defaults["partner"] = FINANCES.defaults()
+
+        if self:
+            self.update(defaults)
+        else:
+            # the defaults are new so there is nothing to copy
+            super(MeansTest, self).update(defaults)
 
         if "category" in session.checker:
             category = session.checker["category"]
@@ -436,38 +436,64 @@ class MeansTest(dict):
         other.update(kwargs)
         recursive_update(self, other)
 
-    def update_from_form(self, form, form_data):
+    @staticmethod
+    def payload(form, form_data):
         payload_class = "{0}Payload".format(form.replace("Form", ""))
-        payload = getattr(sys.modules[__name__], payload_class)
-        self.update(payload(form_data))
+        return getattr(sys.modules[__name__], payload_class)(form_data)
 
-    def update_from_session(self):
+    def update_from_form(self, form, form_data):
+        self.update(self.payload(form, form_data))
+
+    def session_fragment(self, form):
+        """
+        The payload for the session data of `form`, built again only when
+        that data, or the data of the forms it depends on, changes
+        """
+        cache = fragment_cache()
+        key = fragment_key(form)
+        fragment = cache.get(key)
+        if fragment is None:
+            fragment = self.payload(form, flatten(session.checker[form]))
+            cache.set(key, fragment)
+        return fragment
 
-        forms = [
-            "AboutYouForm",
-            "YourBenefitsForm",
-            "AdditionalBenefitsForm",
-            "PropertiesForm",
-            "SavingsForm",
-            "IncomeForm",
-            "OutgoingsForm",
-        ]
-
-        for form in forms:
+    def update_from_session(self):
+        # fragments are shared, recursive_update copies what it merges
+        for form in PAYLOAD_FORMS:
             if form in session.checker:
-                self.update_from_form(form, flatten(session.checker[form]))
+                self.update(self.session_fragment(form))
+
+    def subtree_digests(self):
+        return {key: payload_digest(val) for key, val in self.iteritems()}
+
+    def changed_subtrees(self, digests):
+        """
+        Top level keys of the payload which differ from the last payload
+        saved against the current eligibility check. Everything is sent if a
+        key has gone since, as a patch of the other keys would not remove it.
+        """
+        saved = session.checker.get(SAVED_DIGESTS_KEY) or {}
+        saved_digests = saved.get("d", {})
+        if saved.get("ref") != self.reference or not set(saved_digests).issubset(digests):
+            return dict(self)
+        return {key: self[key] for key, digest in digests.iteritems() if saved_digests.get(key) != digest}
 
     def save(self):
         sentry = getattr(current_app, "sentry", None)
         try:
-            backend = get_api_connection()
+            digests = self.subtree_digests()
 
             if self.reference:
-                backend.eligibility_check(self.reference).patch(self)
+                changes = self.changed_subtrees(digests)
+                if not changes:
+                    return
+                get_api_connection().eligibility_check(self.reference).patch(changes)
             else:
-                response = backend.eligibility_check.post(self)
+                response = get_api_connection().eligibility_check.post(self)
                 self.reference = response["reference"]
                 session.checker["eligibility_check"] = self.reference
+
+            session.checker[SAVED_DIGESTS_KEY] = {"ref": self.reference, "d": digests}
         except (ConnectionError, Timeout, SlumberBaseException):
             if sentry:
                 sentry.captureException()
@@ -0,0 +1,162 @@
+# coding: utf-8
+"Declarative mapping of form fields to eligibility check API paths"
+
+from cla_public.libs.money_interval import MoneyInterval, to_amount
+
+
+def path_setter(path):
+    """
+    Function setting the value at dotted `path` of a nested payload, making
+    the dicts on the way
+    """
+    keys = tuple(path.split("."))
+    parents, leaf = keys[:-1], keys[-1]
+
+    def set_(payload, value):
+        for key in parents:
+            payload = payload.setdefault(key, {})
+        payload[leaf] = value
+
+    return set_
+
+
+def path_filler(path, default):
+    """
+    Function setting the value at dotted `path` of a nested payload to
+    `default()`, unless there is a value already
+    """
+    keys = tuple(path.split("."))
+    parents, leaf = keys[:-1], keys[-1]
+
+    def fill(payload):
+        for key in parents:
+            payload = payload.setdefault(key, {})
+        if leaf not in payload:
+            payload[leaf] = default()
+
+    return fill
+
+
+class Field(object):
+    """
+    The value at API `path`, read as is from the form field `name`. Without a
+    name the value is always the default, which may be a callable making it.
+    """
+
+    def __init__(self, path, name=None, default=None):
+        self.path = path
+        self.name = name
+        self.default = default
+
+    def under(self, path_prefix):
+        return type(self)("{0}.{1}".format(path_prefix, self.path), self.name, self.default)
+
+    def make_default(self):
+        if callable(self.default):
+            return self.default()
+        return self.default
+
+    def reader(self, prefix=""):
+        """
+        Function reading the value from flattened form data, with the field
+        name prefixed by `prefix`
+        """
+        if self.name is None:
+            return lambda form_data: self.make_default()
+        name = prefix + self.name
+        return lambda form_data: form_data.get(name)
+
+
+class Amount(Field):
+    "An amount in pence"
+
+    def __init__(self, path, name=None, default=0):
+        super(Amount, self).__init__(path, name, default)
+
+    def reader(self, prefix=""):
+        if self.name is None:
+            return super(Amount, self).reader(prefix)
+        name = prefix + self.name
+        return lambda form_data: to_amount(form_data.get(name))
+
+
+class Money(Field):
+    "A MoneyInterval read from the amount and interval subfields of a MoneyIntervalField"
+
+    def __init__(self, path, name=None, default=0):
+        super(Money, self).__init__(path, name, default)
+        # money intervals are read only, so one default does for every payload
+        self.default_interval = MoneyInterval(default)
+
+    def make_default(self):
+        return self.default_interval
+
+    def reader(self, prefix=""):
+        if self.name is None:
+            return super(Money, self).reader(prefix)
+        amount = "{0}{1}-per_interval_value".format(prefix, self.name)
+        period = "{0}{1}-interval_period".format(prefix, self.name)
+        return lambda form_data: MoneyInterval(
+            {"per_interval_value": form_data.get(amount), "interval_period": form_data.get(period)}
+        )
+
+
+class Schema(object):
+    """
+    Fields of an API payload, compiled once for each form field prefix in to
+    flat lists of setters and readers
+    """
+
+    def __init__(self, *fields):
+        self.fields = fields
+        self.fillers = [path_filler(field.path, field.make_default) for field in fields]
+        self._compiled = {}
+
+    def __add__(self, other):
+        return Schema(*(self.fields + other.fields))
+
+    def under(self, path_prefix):
+        return Schema(*[field.under(path_prefix) for field in self.fields])
+
+    def updated(self, *fields):
+        """
+        Schema with `fields` in place of the fields at the same paths, or
+        added if there are none
+        """
+        replaced = dict((field.path, field) for field in fields)
+        kept = tuple(replaced.pop(field.path, field) for field in self.fields)
+        return Schema(*(kept + tuple(field for field in fields if field.path in replaced)))
+
+    def compile(self, prefix=""):
+        compiled = self._compiled.get(prefix)
+        if compiled is None:
+            compiled = [
+                (field.name, path_setter(field.path), field.reader(prefix), field.make_default)
+                for field in self.fields
+            ]
+            self._compiled[prefix] = compiled
+        return compiled
+
+    def build(self, form_data, prefix="", skip=()):
+        """
+        Payload with the values read from flattened `form_data`. The form
+        fields named in `skip` were not asked and take their defaults.
+        """
+        payload = {}
+        for name, set_, read, default in self.compile(prefix):
+            set_(payload, default() if name in skip else read(form_data))
+        return payload
+
+    def defaults(self):
+        payload = {}
+        for _, set_, _, default in self.compile():
+            set_(payload, default())
+        return payload
+
+    def fill_defaults(self, payload):
+        """
+        Set the defaults of the fields missing from `payload`
+        """
+        for fill in self.fillers:
+            fill(payload)
+        return payload
@@ -1,19 +1,39 @@
 from collections import OrderedDict
+from functools import partial
 import hashlib
+import logging
 import uuid
+import zlib
 from base64 import b64encode, b64decode
-from datetime import datetime, date, time
+from datetime import datetime, date, time, timedelta
 from speaklater import _LazyString
+from types import InstanceType
 from werkzeug.http import http_date, parse_date
 from flask import Markup, json
 from flask._compat import iteritems, text_type
 from flask.debughelpers import UnexpectedUnicodeError
 from flask import current_app, flash
 from flask.json import JSONEncoder
-from flask.sessions import SecureCookieSession, SecureCookieSessionInterface, SessionMixin, TaggedJSONSerializer
+from flask.sessions import (
+    SecureCookieSession,
+    SecureCookieSessionInterface,
+    SessionMixin,
+    TaggedJSONSerializer,
+    total_seconds,
+)
+from itsdangerous import (
+    BadData,
+    BadSignature,
+    URLSafeSerializerMixin,
+    URLSafeTimedSerializer,
+    base64_encode,
+    want_bytes,
+)
+from werkzeug.contrib.cache import FileSystemCache, RedisCache, SimpleCache
 
 from cla_common.constants import ELIGIBILITY_STATES
 from cla_public.apps.checker.api import post_to_is_eligible_api, ApiError
+from cla_public.apps.checker.categories import category_registry
 from cla_public.apps.checker.constants import (
     F2F_CATEGORIES,
     NO,
@@ -22,9 +42,28 @@ from cla_public.apps.checker.constants import (
     END_SERVICE_FLASH_MESSAGE,
     CONTACT_PREFERENCE,
 )
-from cla_public.apps.checker.means_test import MeansTest
+from cla_public.apps.checker.eligibility_calculator import ShadowEligibilityCalculator, compare_with_backend
+from cla_public.apps.checker.means_test import MeansTest, saved_payload_digest
 from cla_public.apps.checker.utils import passported
-from cla_public.libs.utils import override_locale, category_id_to_name
+from cla_public.libs import metrics
+from cla_public.libs.utils import category_id_to_name
+
+log = logging.getLogger(__name__)
+
+# Session key holding the last eligibility result and the payload it was for
+ELIGIBILITY_RESULT_KEY = "eligibility_result"
+
+ELIGIBILITY_CACHE_TIMEOUT = 60 * 60
+
+NOT_CALCULATED = object()
+
+# Session cookies start with one of these to say whether the session is
+# permanent, so a cookie can be re-signed without decoding its payload. They
+# are outside the signature as they only decide how long the browser keeps
+# the cookie: open_session rejects cookies signed more than
+# PERMANENT_SESSION_LIFETIME ago either way.
+PERMANENT_MARKER = "!"
+BROWSER_SESSION_MARKER = "~"
 
 
 class CustomJSONEncoder(JSONEncoder):
@@ -36,25 +75,86 @@ class CustomJSONEncoder(JSONEncoder):
         return super(CustomJSONEncoder, self).default(obj)
 
 
+class derived_property(object):
+    """
+    Checker session property worked out once and kept until the checker
+    data changes
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.__name__ = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, owner):
+        if obj is None:
+            return self
+        return obj.memoized(self.__name__, partial(self.func, obj))
+
+
 class CheckerSessionObject(dict):
     "Provides some convenience properties for inter-page logic"
     _eligibility = None
 
     def __init__(self, *args, **kwargs):
         super(CheckerSessionObject, self).__init__(*args, **kwargs)
+        self.changed()
+
+    def changed(self):
+        """Forget everything worked out from the checker data"""
         self._eligibility = None
         self._reasons = None
+        self._shadow_eligibility = NOT_CALCULATED
+        self._derived = {}
+
+    def memoized(self, key, compute):
+        """
+        `compute()`, called once until the checker data changes. Only changes
+        to the top level keys are noticed, so save form data by assigning
+        the whole form.
+        """
+        try:
+            return self._derived[key]
+        except KeyError:
+            value = self._derived[key] = compute()
+            return value
 
     def __setitem__(self, *args, **kwargs):
         super(CheckerSessionObject, self).__setitem__(*args, **kwargs)
-        self._eligibility = None
-        self._reasons = None
+        self.changed()
+
+    def __delitem__(self, key):
+        super(CheckerSessionObject, self).__delitem__(key)
+        self.changed()
+
+    def update(self, *args, **kwargs):
+        super(CheckerSessionObject, self).update(*args, **kwargs)
+        self.changed()
+
+    def pop(self, *args):
+        value = super(CheckerSessionObject, self).pop(*args)
+        self.changed()
+        return value
+
+    def popitem(self):
+        item = super(CheckerSessionObject, self).popitem()
+        self.changed()
+        return item
+
+    def setdefault(self, key, default=None):
+        value = super(CheckerSessionObject, self).setdefault(key, default)
+        self.changed()
+        return value
+
+    def clear(self):
+        super(CheckerSessionObject, self).clear()
+        self.changed()
 
     def field(self, form_name, field_name, default=None):
         return self.get(form_name, {}).get(field_name, default)
 
     # TODO: Check if redundant because scope diagnosis manages F2F redirects
-    @property
+    @derived_property
     def needs_face_to_face(self):
         return self.category in F2F_CATEGORIES
 
@@ -66,15 +166,97 @@ class CheckerSessionObject(dict):
     def ineligible(self):
         return self.eligibility == ELIGIBILITY_STATES.NO
 
+    @property
+    def interim_ineligible(self):
+        """
+        Whether the user is already ineligible, for decisions made part way
+        through the checker. Obvious outcomes are decided in-process.
+        """
+        shadow = self.shadow_eligibility
+        if shadow is not None:
+            return shadow == ELIGIBILITY_STATES.NO
+        return self.ineligible
+
+    @derived_property
+    def means_test_forms_completed(self):
+        forms = ["AboutYouForm"]
+        if self.is_on_benefits:
+            forms.append("YourBenefitsForm")
+        if self.is_on_other_benefits:
+            forms.append("AdditionalBenefitsForm")
+        if self.owns_property:
+            forms.append("PropertiesForm")
+        if self.has_savings_or_valuables:
+            forms.append("SavingsForm")
+        if not self.is_on_passported_benefits:
+            forms.extend(["IncomeForm", "OutgoingsForm"])
+        return all(self.field(form, "is_completed", False) for form in forms)
+
+    @property
+    def shadow_eligibility(self):
+        if self._shadow_eligibility is NOT_CALCULATED:
+            means_test = MeansTest()
+            means_test.update_from_session()
+            thresholds = current_app.config.get("ELIGIBILITY_THRESHOLDS")
+            result = ShadowEligibilityCalculator(means_test, thresholds).is_eligible()
+            if result == ELIGIBILITY_STATES.YES and not self.means_test_forms_completed:
+                # zeroed defaults stand in for forms not filled in yet
+                result = None
+            self._shadow_eligibility = result
+        return self._shadow_eligibility
+
     @property
     def eligibility(self):
         if self._eligibility is None:
             try:
-                self._eligibility, self._reasons = post_to_is_eligible_api()
+                eligibility, reasons = self.cached_eligibility()
             except ApiError:
-                self._eligibility = ELIGIBILITY_STATES.UNKNOWN
+                eligibility, reasons = ELIGIBILITY_STATES.UNKNOWN, None
+            self._eligibility, self._reasons = eligibility, reasons
         return self._eligibility
 
+    @property
+    def eligibility_cache_key(self):
+        """
+        Eligibility results are content addressed: the same eligibility check
+        reference, category and saved payload always give the same result.
+        None if the check has not been saved from the means test, as there is
+        nothing to address the result by.
+        """
+        reference = self.get("eligibility_check")
+        digest = saved_payload_digest() if reference else None
+        if digest is None:
+            return None
+        return "eligibility:{ref}:{category}:{digest}".format(ref=reference, category=self.category, digest=digest)
+
+    def cached_eligibility(self):
+        key = self.eligibility_cache_key
+        if key is None:
+            return post_to_is_eligible_api()
+
+        stored = self.get(ELIGIBILITY_RESULT_KEY) or {}
+        if stored.get("key") == key:
+            metrics.incr("eligibility_cache.hits")
+            return stored["is_eligible"], stored["reasons"]
+
+        result = current_app.cache.get(key)
+        if result is not None:
+            metrics.incr("eligibility_cache.hits")
+        else:
+            metrics.incr("eligibility_cache.misses")
+            result = post_to_is_eligible_api()
+            compare_with_backend(self.shadow_eligibility, result[0], self.get("eligibility_check"))
+            if result[0] in (None, ELIGIBILITY_STATES.UNKNOWN):
+                # timeouts and unsaved checks are not worth remembering
+                return result
+            current_app.cache.set(key, result, timeout=ELIGIBILITY_CACHE_TIMEOUT)
+
+        is_eligible, reasons = result
+        # the result is worked out from the checker data rather than part of
+        # it, so storing it must not forget the other memos
+        dict.__setitem__(self, ELIGIBILITY_RESULT_KEY, {"key": key, "is_eligible": is_eligible, "reasons": reasons})
+        return is_eligible, reasons
+
     @property
     def need_more_info(self):
         """Show we need more information page instead of eligible"""
@@ -93,14 +275,12 @@ class CheckerSessionObject(dict):
     def category_name(self):
         return category_id_to_name(self.category)
 
-    @property
+    @derived_property
     def category_slug(self):
-        # force english translation for slug
-        cat_name = self.category_name
-        if cat_name:
-            with override_locale("en"):
-                slug = cat_name.lower().replace(" ", "-")
-            return slug
+        # slugs are always the english name
+        category = category_registry.get(self.category)
+        if category:
+            return category.slug
 
     def is_yes(self, form, field):
         return self.field(form, field, NO) == YES
@@ -113,7 +293,7 @@ class CheckerSessionObject(dict):
     def has_valuables(self):
         return self.is_yes("AboutYouForm", "have_valuables")
 
-    @property
+    @derived_property
     def has_savings_or_valuables(self):
         return self.has_savings or self.has_valuables
 
@@ -125,11 +305,11 @@ class CheckerSessionObject(dict):
     def is_on_benefits(self):
         return self.is_yes("AboutYouForm", "on_benefits")
 
-    @property
+    @derived_property
     def is_on_passported_benefits(self):
         return self.is_on_benefits and passported(self.field("YourBenefitsForm", "benefits", []))
 
-    @property
+    @derived_property
     def is_on_other_benefits(self):
         benefits = set(self.field("YourBenefitsForm", "benefits", []))
         other_benefits = benefits.difference(PASSPORTED_BENEFITS).difference({"child_benefit"})
@@ -203,12 +383,85 @@ class CheckerSession(SecureCookieSession, SessionMixin):
     _key = "checker"
     _stored_key = "stored"
     expires_override = None
+    # digest of the payload and time the cookie was signed, when loaded from one
+    loaded_digest = None
+    signed_at = None
+    # permanent flag from the cookie's marker, None for cookies without one
+    cookie_permanent = None
+
+    # verified cookie payload not decoded yet, see defer_load
+    _payload = None
+    _load_payload = None
 
     def __init__(self, *args, **kwargs):
         self.checker = CheckerSessionObject()
         self.stored = {}
         super(CheckerSession, self).__init__(*args, **kwargs)
 
+    def defer_load(self, payload, load_payload):
+        """
+        Decode `payload` with `load_payload(session, payload)` the first time
+        the session is used rather than now. Every dict method reading or
+        writing the data loads first, which TestDeferredLoad checks against
+        dir(dict); SessionMixin's `permanent` goes through `get`.
+        """
+        self._payload = payload
+        self._load_payload = load_payload
+
+    @property
+    def is_loaded(self):
+        return self._payload is None
+
+    @property
+    def payload(self):
+        return self._payload
+
+    def load(self):
+        if self._payload is not None:
+            payload, self._payload = self._payload, None
+            self._load_payload(self, payload)
+
+    def loads_first(name):
+        def oncall(self, *args, **kwargs):
+            if self._payload is not None:
+                self.load()
+            return getattr(super(CheckerSession, self), name)(*args, **kwargs)
+
+        oncall.__name__ = name
+        return oncall
+
+    __getitem__ = loads_first("__getitem__")
+    __setitem__ = loads_first("__setitem__")
+    __delitem__ = loads_first("__delitem__")
+    __contains__ = loads_first("__contains__")
+    __iter__ = loads_first("__iter__")
+    __len__ = loads_first("__len__")
+    __eq__ = loads_first("__eq__")
+    __ne__ = loads_first("__ne__")
+    __lt__ = loads_first("__lt__")
+    __le__ = loads_first("__le__")
+    __gt__ = loads_first("__gt__")
+    __ge__ = loads_first("__ge__")
+    __cmp__ = loads_first("__cmp__")
+    __repr__ = loads_first("__repr__")
+    get = loads_first("get")
+    has_key = loads_first("has_key")
+    keys = loads_first("keys")
+    values = loads_first("values")
+    items = loads_first("items")
+    iterkeys = loads_first("iterkeys")
+    itervalues = loads_first("itervalues")
+    iteritems = loads_first("iteritems")
+    viewkeys = loads_first("viewkeys")
+    viewvalues = loads_first("viewvalues")
+    viewitems = loads_first("viewitems")
+    copy = loads_first("copy")
+    pop = loads_first("pop")
+    popitem = loads_first("popitem")
+    setdefault = loads_first("setdefault")
+    update = loads_first("update")
+    del loads_first
+
     @property
     def checker(self):
         return self[self._key]
@@ -256,6 +509,7 @@ class CheckerSession(SecureCookieSession, SessionMixin):
 
     def clear(self):
         if current_app.config["CLEAR_SESSION"]:
+            self._payload = None
             super(CheckerSession, self).clear()
             self.checker = CheckerSessionObject()
 
@@ -323,7 +577,12 @@ class Tag:
         return value
 
 
-class CheckerTaggedJSONSerializer(TaggedJSONSerializer):
+class LegacyCheckerTaggedJSONSerializer(TaggedJSONSerializer):
+    """
+    The original serializer, kept to check and benchmark
+    CheckerTaggedJSONSerializer against
+    """
+
     def dumps(self, value):
         return json.dumps(Tag().checkTag(value), separators=(",", ":"))
 
@@ -355,14 +614,323 @@ class CheckerTaggedJSONSerializer(TaggedJSONSerializer):
         return json.loads(value, object_hook=object_hook)
 
 
+class CheckerTaggedJSONSerializer(TaggedJSONSerializer):
+    """
+    Serializes the session in the same format as the legacy serializer,
+    except that object keys are not sorted.
+
+    Encoders are looked up by the exact type of each value. Types not in the
+    table are resolved in the same order as Tag.checkTag and remembered.
+    """
+
+    def __init__(self):
+        self.encoders = {
+            CheckerSessionObject: self.encode_checker_session_object,
+            MeansTest: self.encode_means_test,
+            tuple: self.encode_tuple,
+            uuid.UUID: self.encode_uuid,
+            bytes: self.encode_bytes,
+            Markup: self.encode_markup,
+            list: self.encode_list,
+            datetime: self.encode_datetime,
+            dict: self.encode_dict,
+            text_type: None,
+            int: None,
+            long: None,
+            float: None,
+            bool: None,
+            type(None): None,
+        }
+        self.resolution_order = [
+            (CheckerSessionObject, self.encode_checker_session_object),
+            (MeansTest, self.encode_means_test),
+            (tuple, self.encode_tuple),
+            (uuid.UUID, self.encode_uuid),
+            (bytes, self.encode_bytes),
+            ("markup", self.encode_markup),
+            (list, self.encode_list),
+            (datetime, self.encode_datetime),
+            (dict, self.encode_dict),
+        ]
+        self.decoders = {
+            " t": tuple,
+            " u": uuid.UUID,
+            " b": b64decode,
+            " m": Markup,
+            " d": parse_date,
+            " ch": self.decode_checker_session_object,
+            " mt": self.decode_means_test,
+        }
+
+    def resolve(self, value):
+        encoder = None
+        for data_type, method in self.resolution_order:
+            if data_type == "markup":
+                if callable(getattr(value, "__html__", None)):
+                    encoder = method
+                    break
+            elif isinstance(value, data_type):
+                encoder = method
+                break
+        # __html__ can only be trusted per type if it can't come from __getattr__
+        # on the instance, eg. old style class instances or lazy strings
+        value_type = type(value)
+        if not hasattr(value_type, "__getattr__") and value_type is not InstanceType:
+            self.encoders[value_type] = encoder
+        return encoder
+
+    def encode(self, value):
+        try:
+            encoder = self.encoders[type(value)]
+        except KeyError:
+            encoder = self.resolve(value)
+        if encoder is None:
+            return value
+        return encoder(value)
+
+    def encode_checker_session_object(self, value):
+        return {" ch": self.encode_dict(value)}
+
+    def encode_means_test(self, value):
+        return {" mt": self.encode_dict(value)}
+
+    def encode_tuple(self, value):
+        return {" t": self.encode_list(value)}
+
+    def encode_uuid(self, value):
+        return {" u": value.hex}
+
+    def encode_bytes(self, value):
+        return {" b": b64encode(value).decode("ascii")}
+
+    def encode_markup(self, value):
+        return {" m": text_type(value.__html__())}
+
+    def encode_list(self, value):
+        encode = self.encode
+        return [encode(x) for x in value]
+
+    def encode_datetime(self, value):
+        return {" d": http_date(value)}
+
+    def encode_dict(self, value):
+        encode = self.encode
+        return dict((k, encode(v)) for k, v in iteritems(value))
+
+    def decode_checker_session_object(self, value):
+        c = CheckerSessionObject()
+        c.update(value)
+        return c
+
+    def decode_means_test(self, value):
+        m = MeansTest()
+        m.update(value)
+        return m
+
+    def decode_object(self, obj):
+        if len(obj) == 1:
+            for key in obj:
+                decoder = self.decoders.get(key)
+                if decoder is not None:
+                    return decoder(obj[key])
+        return obj
+
+    def dumps(self, value):
+        # unsorted keys let json use its C encoder
+        return json.dumps(self.encode(value), separators=(",", ":"), sort_keys=False)
+
+    def loads(self, value):
+        return json.loads(value, object_hook=self.decode_object)
+
+
 checker_session_serializer = CheckerTaggedJSONSerializer()
 
 
+def payload_digest(payload):
+    return hashlib.sha1(payload).hexdigest()
+
+
+class CompressedURLSafeTimedSerializer(URLSafeTimedSerializer):
+    """
+    URLSafeTimedSerializer with a configurable zlib compression level.
+    Payloads keep the same format: compressed ones are marked with a
+    leading "." so older cookies, compressed or not, still load.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.compression_level = kwargs.pop("compression_level", 6)
+        super(CompressedURLSafeTimedSerializer, self).__init__(*args, **kwargs)
+
+    def encode_json(self, json):
+        json = want_bytes(json)
+        compressed = zlib.compress(json, self.compression_level)
+        if len(compressed) < (len(json) - 1):
+            return b"." + base64_encode(compressed)
+        return base64_encode(json)
+
+    def dump_payload(self, obj):
+        return self.encode_json(super(URLSafeSerializerMixin, self).dump_payload(obj))
+
+    def dumps_json(self, json):
+        """
+        Sign a payload already serialized with the internal serializer
+        """
+        rv = self.make_signer(self.salt).sign(self.encode_json(json))
+        if self.is_text_serializer:
+            rv = rv.decode("utf-8")
+        return rv
+
+
 class CheckerSessionInterface(SecureCookieSessionInterface):
     digest_method = staticmethod(hashlib.sha256)
     session_class = CheckerSession
     serializer = checker_session_serializer
 
+    def get_signing_serializer(self, app):
+        if not app.secret_key:
+            return None
+        signer_kwargs = dict(key_derivation=self.key_derivation, digest_method=self.digest_method)
+        return CompressedURLSafeTimedSerializer(
+            app.secret_key,
+            salt=self.salt,
+            serializer=self.serializer,
+            signer_kwargs=signer_kwargs,
+            compression_level=app.config.get("SESSION_COOKIE_COMPRESSION_LEVEL", 6),
+        )
+
+    def check_cookie_size(self, app, session, value):
+        """
+        Record sessions whose cookie is larger than SESSION_COOKIE_SIZE_BUDGET,
+        logging the largest parts of the checker state
+        """
+        budget = app.config.get("SESSION_COOKIE_SIZE_BUDGET")
+        if not budget or len(value) <= budget:
+            return
+        metrics.incr("session.oversized")
+        sizes = sorted(
+            ((len(self.serializer.dumps(item)), key) for key, item in iteritems(session.checker)), reverse=True
+        )
+        log.warning(
+            "Session cookie of %d bytes is over the budget of %d bytes, largest parts: %s",
+            len(value),
+            budget,
+            ", ".join("%s=%d" % (key, size) for size, key in sizes[:3]),
+        )
+
+    def open_session(self, app, request):
+        """
+        Verify the cookie's signature now but only decode the session when
+        it is first used
+        """
+        s = self.get_signing_serializer(app)
+        if s is None:
+            return None
+        val = request.cookies.get(app.session_cookie_name)
+        if not val:
+            return self.session_class()
+        marker = val[0] if val[0] in (PERMANENT_MARKER, BROWSER_SESSION_MARKER) else None
+        if marker:
+            val = val[1:]
+        max_age = total_seconds(app.permanent_session_lifetime)
+        try:
+            payload, signed_at = s.make_signer(s.salt).unsign(val, max_age, return_timestamp=True)
+        except BadSignature:
+            return self.session_class()
+        session = self.session_class()
+        session.signed_at = signed_at
+        if marker:
+            session.cookie_permanent = marker == PERMANENT_MARKER
+        session.defer_load(payload, partial(self.load_payload, s))
+        return session
+
+    def load_payload(self, s, session, payload):
+        try:
+            data = s.load_payload(payload)
+        except BadData:
+            log.warning("Could not decode session payload", exc_info=True)
+            return
+        dict.update(session, data)
+        # dumping the loaded session again gives the same payload if it is
+        # unchanged at the end of the request, whatever the cookie's key order
+        session.loaded_digest = payload_digest(self.serializer.dumps(dict(session)))
+
+    def is_recently_signed(self, app, session):
+        refresh_interval = timedelta(seconds=app.config.get("SESSION_REFRESH_INTERVAL", 60))
+        return datetime.utcnow() - session.signed_at < refresh_interval
+
+    def is_unchanged(self, app, session, payload):
+        """
+        True if the cookie the session was loaded from is still good: same
+        content, same expiry and signed less than SESSION_REFRESH_INTERVAL
+        seconds ago
+        """
+        if session.loaded_digest is None or session.expires_override:
+            return False
+        if payload_digest(payload) != session.loaded_digest:
+            return False
+        return self.is_recently_signed(app, session)
+
+    def cookie_marker(self, permanent):
+        return PERMANENT_MARKER if permanent else BROWSER_SESSION_MARKER
+
+    def unloaded_expiration_time(self, app, session):
+        """
+        Expiry of a cookie re-signed without decoding it, as for a loaded
+        session but with the permanent flag taken from the cookie's marker
+        """
+        if session.cookie_permanent:
+            return datetime.utcnow() + app.permanent_session_lifetime
+        return None
+
+    def save_unloaded_session(self, app, session, response):
+        """
+        Nothing used the session so it is unchanged: skip the cookie, or once
+        it is due a refresh re-sign the payload it came with. Neither decodes
+        the payload, except for cookies from before the permanent marker.
+        """
+        if self.is_recently_signed(app, session):
+            metrics.incr("session.write_skipped")
+            return
+        if session.cookie_permanent is None:
+            session.load()
+            return self.save_session(app, session, response)
+        expires = self.unloaded_expiration_time(app, session)
+        s = self.get_signing_serializer(app)
+        val = s.make_signer(s.salt).sign(session.payload)
+        if s.is_text_serializer:
+            val = val.decode("utf-8")
+        response.set_cookie(
+            app.session_cookie_name,
+            self.cookie_marker(session.cookie_permanent) + val,
+            expires=expires,
+            httponly=self.get_cookie_httponly(app),
+            domain=self.get_cookie_domain(app),
+            path=self.get_cookie_path(app),
+            secure=self.get_cookie_secure(app),
+        )
+
+    def save_session(self, app, session, response):
+        if not session.is_loaded:
+            return self.save_unloaded_session(app, session, response)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        if not session:
+            if session.modified:
+                response.delete_cookie(app.session_cookie_name, domain=domain, path=path)
+            return
+        payload = self.serializer.dumps(dict(session))
+        if self.is_unchanged(app, session, payload):
+            metrics.incr("session.write_skipped")
+            return
+        httponly = self.get_cookie_httponly(app)
+        secure = self.get_cookie_secure(app)
+        expires = self.get_expiration_time(app, session)
+        val = self.cookie_marker(session.permanent) + self.get_signing_serializer(app).dumps_json(payload)
+        self.check_cookie_size(app, session, val)
+        response.set_cookie(
+            app.session_cookie_name, val, expires=expires, httponly=httponly, domain=domain, path=path, secure=secure
+        )
+
     # Need to override the expires so that we can set the
     # session to expire 20 seconds from page close
     def get_expiration_time(self, app, session):
@@ -371,3 +939,96 @@ class CheckerSessionInterface(SecureCookieSessionInterface):
                 return session.expires_override
 
             return datetime.utcnow() + app.permanent_session_lifetime
+
+
+class ServerSideCheckerSessionInterface(CheckerSessionInterface):
+    """
+    Keeps the session in a server side `store`, any werkzeug cache. The
+    cookie only carries a signed session id. Stored sessions expire with the
+    cookie, including the short expiry set by session_end.
+    """
+
+    key_prefix = "session:"
+
+    def __init__(self, store):
+        self.store = store
+
+    def store_timeout(self, app, expires):
+        if expires is None:
+            return int(total_seconds(app.permanent_session_lifetime))
+        return max(1, int(total_seconds(expires - datetime.utcnow())))
+
+    def open_session(self, app, request):
+        s = self.get_signing_serializer(app)
+        if s is None:
+            return None
+        val = request.cookies.get(app.session_cookie_name)
+        if val:
+            try:
+                sid = s.loads(val, max_age=total_seconds(app.permanent_session_lifetime))
+            except BadSignature:
+                sid = None
+            # a cookie holding a whole session is left over from cookie mode
+            if not isinstance(sid, basestring):
+                sid = None
+            data = self.store.get(self.key_prefix + sid) if sid else None
+            if data is not None:
+                session = self.session_class(self.serializer.loads(data))
+                session.sid = sid
+                return session
+        return self.session_class()
+
+    def save_session(self, app, session, response):
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        sid = getattr(session, "sid", None)
+        if not session:
+            if session.modified:
+                if sid:
+                    self.store.delete(self.key_prefix + sid)
+                response.delete_cookie(app.session_cookie_name, domain=domain, path=path)
+            return
+        httponly = self.get_cookie_httponly(app)
+        secure = self.get_cookie_secure(app)
+        expires = self.get_expiration_time(app, session)
+        sid = sid or uuid.uuid4().hex
+        self.store.set(
+            self.key_prefix + sid, self.serializer.dumps(dict(session)), timeout=self.store_timeout(app, expires)
+        )
+        session.sid = sid
+        val = self.get_signing_serializer(app).dumps(sid)
+        response.set_cookie(
+            app.session_cookie_name, val, expires=expires, httponly=httponly, domain=domain, path=path, secure=secure
+        )
+
+
+def create_session_interface(app):
+    """
+    The session interface selected by SESSION_STORE: "cookie" keeps the
+    whole session in the cookie, "filesystem" (single node) and "redis"
+    (several nodes) keep it on the server. "simple" is a process local
+    store for tests.
+
+    The "filesystem" and "simple" stores delete sessions, live or not, once
+    they hold more than SESSION_STORE_THRESHOLD, so it must be above the
+    number of sessions started within PERMANENT_SESSION_LIFETIME at peak.
+    """
+    store_type = app.config.get("SESSION_STORE", "cookie")
+    if store_type == "cookie":
+        return CheckerSessionInterface()
+    if store_type == "filesystem":
+        store = FileSystemCache(app.config["SESSION_STORE_DIR"], threshold=app.config["SESSION_STORE_THRESHOLD"])
+    elif store_type == "redis":
+        try:
+            from redis import from_url
+        except ImportError:
+            raise ValueError("SESSION_STORE redis needs the redis package installed")
+        if not app.config.get("SESSION_STORE_REDIS_URL"):
+            raise ValueError("SESSION_STORE redis needs SESSION_STORE_REDIS_URL")
+
+        store = RedisCache(host=from_url(app.config["SESSION_STORE_REDIS_URL"]), key_prefix="cla_public_")
+    elif store_type == "simple":
+        store = SimpleCache(threshold=app.config["SESSION_STORE_THRESHOLD"])
+    else:
+        raise ValueError("Unknown SESSION_STORE %s" % store_type)
+    return ServerSideCheckerSessionInterface(store)
@@ -1,9 +1,12 @@
 from copy import copy
 import json
 import os
+import threading
 import mock
+import requests
 
-from cla_public.apps.checker.cait_intervention import get_cait_params
+from cla_public.apps.checker import cait_intervention
+from cla_public.apps.checker.cait_intervention import BACKGROUND_FETCH_TIMEOUT, get_cait_params
 from cla_public.apps.base.tests import FlaskAppTestCase
 
 
@@ -23,6 +26,7 @@ def setup_mock_response(mock_json, mock_status):
             def __init__(self, mock_json, mock_status):
                 self.json_data = mock_json
                 self.status_code = mock_status
+                self.headers = {}
 
             def json(self):
                 return json.loads(self.json_data)
@@ -178,3 +182,76 @@ class TestCaitIntervention(FlaskAppTestCase):
             params = copy(DEFAULT_PARAMS_OUT)
             params.update(call_cait_params())
             self.assertEqual(params, DEFAULT_PARAMS_OUT)
+
+
+class TestCaitConfigRefresh(FlaskAppTestCase):
+    def setUp(self):
+        super(TestCaitConfigRefresh, self).setUp()
+        self.response = requests.Response()
+        self.response.status_code = 200
+        self.response.headers["ETag"] = '"v1"'
+        self.response._content = json.dumps({"intervention": {}})
+
+    def test_revalidates_with_etag(self):
+        with mock.patch(REQUESTS_GET, return_value=self.response) as mock_get:
+            self.assertEqual({"intervention": {}}, cait_intervention.get_config())
+
+            self.response.status_code = 304
+            self.response._content = ""
+            self.app.config["CAIT_CONFIG_REFRESH_INTERVAL"] = -1
+            self.assertEqual({"intervention": {}}, cait_intervention.get_config())
+            self.assertEqual('"v1"', mock_get.call_args[1]["headers"]["If-None-Match"])
+
+    def test_serves_stale_copy_while_refreshing(self):
+        with mock.patch(REQUESTS_GET, return_value=self.response):
+            cait_intervention.get_config()
+
+        self.app.config["CAIT_CONFIG_BACKGROUND_REFRESH"] = True
+        self.app.config["CAIT_CONFIG_REFRESH_INTERVAL"] = -1
+        release = threading.Event()
+
+        def slow_get(*args, **kwargs):
+            release.wait(1)
+            return self.response
+
+        with mock.patch(REQUESTS_GET, side_effect=slow_get) as mock_get:
+            self.assertEqual({"intervention": {}}, cait_intervention.get_config())
+            release.set()
+            # wait for the refresh to finish
+            with cait_intervention._refresh_lock:
+                self.assertEqual(1, mock_get.call_count)
+
+    def test_cold_cache_fetches_in_background(self):
+        self.app.config["CAIT_CONFIG_BACKGROUND_REFRESH"] = True
+        with mock.patch(REQUESTS_GET, return_value=self.response) as mock_get:
+            self.assertRaises(cait_intervention.ConfigException, cait_intervention.get_config)
+            # wait for the refresh to finish
+            with cait_intervention._refresh_lock:
+                self.assertEqual(BACKGROUND_FETCH_TIMEOUT, mock_get.call_args[1]["timeout"])
+            self.assertEqual({"intervention": {}}, cait_intervention.get_config())
+
+    def test_failed_fetch_waits_for_interval(self):
+        with mock.patch(REQUESTS_GET, side_effect=requests.ConnectionError) as mock_get:
+            self.assertRaises(cait_intervention.ConfigException, cait_intervention.get_config)
+            self.assertRaises(cait_intervention.ConfigException, cait_intervention.get_config)
+        self.assertEqual(1, mock_get.call_count)
+
+    def test_error_response_keeps_last_good_copy(self):
+        with mock.patch(REQUESTS_GET, return_value=self.response):
+            cait_intervention.get_config()
+
+        self.app.config["CAIT_CONFIG_REFRESH_INTERVAL"] = -1
+        rate_limited = requests.Response()
+        rate_limited.status_code = 403
+        rate_limited._content = json.dumps({"message": "API rate limit exceeded"})
+        with mock.patch(REQUESTS_GET, return_value=rate_limited):
+            self.assertEqual({"intervention": {}}, cait_intervention.get_config())
+        with mock.patch(REQUESTS_GET, side_effect=requests.exceptions.ChunkedEncodingError):
+            self.assertEqual({"intervention": {}}, cait_intervention.get_config())
+
+    def test_lock_released_when_thread_fails_to_start(self):
+        with mock.patch.object(threading.Thread, "start", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                cait_intervention.refresh_in_background()
+        self.assertTrue(cait_intervention._refresh_lock.acquire(False))
+        cait_intervention._refresh_lock.release()
@@ -0,0 +1,32 @@
+# coding: utf-8
+import shutil
+import tempfile
+import unittest
+
+from cla_public.apps.checker.categories import CategoryRegistry
+from cla_public.apps.checker.constants import CATEGORIES
+from cla_public.apps.checker.utils import category_option_from_name
+
+
+class TestCategoryRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = CategoryRegistry(CATEGORIES)
+
+    def test_lookups(self):
+        category = self.registry.get("aap")
+        self.assertEqual(u"Trouble with the police", category.name)
+        self.assertEqual("trouble-with-the-police", category.slug)
+        self.assertEqual("Action against police", category.organisation_name)
+        self.assertIs(category, self.registry.from_name(u"Trouble with the police"))
+        self.assertIs(category, self.registry.from_slug("Trouble with the police"))
+        self.assertIsNone(self.registry.get("unknown"))
+
+    def test_option_from_english_name(self):
+        self.assertEqual("violence", category_option_from_name(u"Domestic abuse")[0])
+        self.assertEqual((None, None, None), category_option_from_name(u"Cam-drin domestig"))
+
+    def test_untranslated_locale_uses_english(self):
+        dirname = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, dirname)
+        self.registry.translate(dirname, ["cy"])
+        self.assertEqual(u"Debt", self.registry.get("debt").translated_name("cy"))
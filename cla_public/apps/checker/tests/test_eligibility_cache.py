@@ -0,0 +1,77 @@
+from flask import session
+from mock import patch
+
+from cla_common.constants import ELIGIBILITY_STATES
+from cla_public.apps.base.tests import FlaskAppTestCase
+from cla_public.apps.checker.means_test import SAVED_DIGESTS_KEY
+from cla_public.libs import metrics
+
+
+class TestEligibilityCache(FlaskAppTestCase):
+    def setUp(self):
+        super(TestEligibilityCache, self).setUp()
+        self.app.cache.clear()
+        metrics.reset()
+        session.clear()
+        session.checker["eligibility_check"] = "ref"
+        session.checker[SAVED_DIGESTS_KEY] = {"ref": "ref", "d": {"you": "abc"}}
+
+    def eligibility(self):
+        # force re-evaluation as a new request would
+        session.checker._eligibility = None
+        return session.checker.eligibility
+
+    @patch("cla_public.apps.checker.session.post_to_is_eligible_api")
+    def test_backend_called_once_per_payload(self, mock_is_eligible):
+        mock_is_eligible.return_value = (ELIGIBILITY_STATES.NO, ["reason"])
+
+        self.assertEqual(ELIGIBILITY_STATES.NO, self.eligibility())
+        self.assertEqual(ELIGIBILITY_STATES.NO, self.eligibility())
+        self.assertEqual(["reason"], session.checker.ineligible_reasons)
+        self.assertEqual(1, mock_is_eligible.call_count)
+        self.assertEqual(1, metrics.get("eligibility_cache.hits"))
+        self.assertEqual(1, metrics.get("eligibility_cache.misses"))
+
+    @patch("cla_public.apps.checker.session.post_to_is_eligible_api")
+    def test_changed_payload_misses(self, mock_is_eligible):
+        mock_is_eligible.return_value = (ELIGIBILITY_STATES.YES, [])
+        self.eligibility()
+
+        session.checker[SAVED_DIGESTS_KEY] = {"ref": "ref", "d": {"you": "def"}}
+        self.eligibility()
+        self.assertEqual(2, mock_is_eligible.call_count)
+
+    @patch("cla_public.apps.checker.session.post_to_is_eligible_api")
+    def test_shared_cache_used_for_new_session(self, mock_is_eligible):
+        mock_is_eligible.return_value = (ELIGIBILITY_STATES.YES, [])
+        self.eligibility()
+
+        del session.checker["eligibility_result"]
+        self.assertEqual(ELIGIBILITY_STATES.YES, self.eligibility())
+        self.assertEqual(1, mock_is_eligible.call_count)
+
+    @patch("cla_public.apps.checker.session.post_to_is_eligible_api")
+    def test_unknown_is_not_cached(self, mock_is_eligible):
+        mock_is_eligible.return_value = (ELIGIBILITY_STATES.UNKNOWN, [])
+        self.eligibility()
+        self.eligibility()
+        self.assertEqual(2, mock_is_eligible.call_count)
+
+    @patch("cla_public.apps.checker.session.post_to_is_eligible_api")
+    def test_unsaved_check_is_not_cached(self, mock_is_eligible):
+        mock_is_eligible.return_value = (ELIGIBILITY_STATES.YES, [])
+        del session.checker[SAVED_DIGESTS_KEY]
+        self.eligibility()
+        self.eligibility()
+        self.assertEqual(2, mock_is_eligible.call_count)
+        self.assertNotIn("eligibility_result", session.checker)
+
+    @patch("cla_public.apps.checker.session.post_to_is_eligible_api")
+    def test_storing_result_keeps_memos(self, mock_is_eligible):
+        mock_is_eligible.return_value = (ELIGIBILITY_STATES.YES, [])
+        session.checker._shadow_eligibility = ELIGIBILITY_STATES.YES
+        session.checker.memoized("answer", lambda: 42)
+        self.eligibility()
+        self.assertEqual(ELIGIBILITY_STATES.YES, session.checker._shadow_eligibility)
+        self.assertEqual(42, session.checker.memoized("answer", lambda: 0))
+        self.assertIn("eligibility_result", session.checker)
@@ -0,0 +1,134 @@
+import logging
+import unittest
+
+from flask import session
+from werkzeug.datastructures import MultiDict
+
+from cla_common.constants import ELIGIBILITY_STATES
+from cla_public.apps.base.tests import FlaskAppTestCase
+from cla_public.apps.checker.constants import YES, NO
+from cla_public.apps.checker.eligibility_calculator import ShadowEligibilityCalculator
+from cla_public.apps.checker.forms import (
+    AboutYouForm,
+    YourBenefitsForm,
+    AdditionalBenefitsForm,
+    PropertiesForm,
+    SavingsForm,
+    IncomeForm,
+    OutgoingsForm,
+)
+from cla_public.apps.checker.means_test import MeansTest
+from cla_public.apps.checker.tests.test_integration import form_data, is_test, spreadsheet
+from cla_public.libs.money_interval import MoneyInterval
+
+
+logging.getLogger("MARKDOWN").setLevel(logging.WARNING)
+
+
+def finances(earnings=0, savings=0):
+    return {
+        "income": {"earnings": MoneyInterval(earnings), "other_income": MoneyInterval(0)},
+        "deductions": {"income_tax": MoneyInterval(0), "criminal_legalaid_contributions": 0},
+        "savings": {"bank_balance": savings, "investment_balance": 0, "asset_balance": 0, "credit_balance": 0},
+    }
+
+
+def posted(data):
+    """
+    Form data as it arrives in a POST: strings, with empty values left out
+    """
+    formdata = MultiDict()
+    for name, value in data.items():
+        for item in value if isinstance(value, list) else [value]:
+            if item is not None:
+                formdata.add(name, unicode(item))
+    return formdata
+
+
+class TestShadowEligibilityCalculator(unittest.TestCase):
+    def calculate(self, **payload):
+        payload.setdefault("you", finances())
+        return ShadowEligibilityCalculator(payload).is_eligible()
+
+    def test_capital_over_limit(self):
+        self.assertEqual(ELIGIBILITY_STATES.NO, self.calculate(you=finances(savings=800001)))
+
+    def test_capital_over_limit_with_pensioner_disregard(self):
+        result = self.calculate(you=finances(savings=800001), is_you_or_your_partner_over_60=YES)
+        self.assertNotEqual(ELIGIBILITY_STATES.NO, result)
+
+    def test_main_home_equity_disregarded(self):
+        prop = {"value": 10800000, "mortgage_left": 0, "share": 100, "main": YES, "disputed": NO}
+        self.assertNotEqual(ELIGIBILITY_STATES.NO, self.calculate(property_set=[prop]))
+
+        prop["value"] = 10800001
+        self.assertEqual(ELIGIBILITY_STATES.NO, self.calculate(property_set=[prop]))
+
+    def test_gross_income_over_limit(self):
+        self.assertEqual(ELIGIBILITY_STATES.NO, self.calculate(you=finances(earnings=265701)))
+
+    def test_gross_income_limit_raised_for_dependants(self):
+        calculator = ShadowEligibilityCalculator({"dependants_young": 3, "dependants_old": 2})
+        self.assertEqual(265700 + 22200, calculator.gross_income_limit())
+
+    def test_passported_skips_income(self):
+        self.assertIsNone(self.calculate(you=finances(earnings=265701), on_passported_benefits=YES))
+
+    def test_obviously_eligible(self):
+        self.assertEqual(ELIGIBILITY_STATES.YES, self.calculate(you=finances(earnings=50000)))
+
+    def test_property_left_to_backend(self):
+        prop = {"value": 100000, "mortgage_left": 0, "share": 100, "main": YES, "disputed": NO}
+        self.assertIsNone(self.calculate(you=finances(earnings=50000), property_set=[prop]))
+
+    def test_unknown_amounts_defer(self):
+        self.assertIsNone(self.calculate(you=finances(earnings=None)))
+
+    def test_configurable_thresholds(self):
+        payload = {"you": finances(savings=500000)}
+        result = ShadowEligibilityCalculator(payload, {"capital_limit": 400000}).is_eligible()
+        self.assertEqual(ELIGIBILITY_STATES.NO, result)
+
+
+class TestShadowEligibilityScenarios(FlaskAppTestCase):
+    """
+    Whenever the shadow calculator decides an outcome it must agree with the
+    outcome recorded for the scenario in data/means_test.xlsx
+    """
+
+    def relevant_forms(self):
+        yield AboutYouForm
+        if session.checker.is_on_benefits:
+            yield YourBenefitsForm
+        if session.checker.is_on_other_benefits:
+            yield AdditionalBenefitsForm
+        if session.checker.owns_property:
+            yield PropertiesForm
+        if session.checker.has_savings_or_valuables:
+            yield SavingsForm
+        if not session.checker.is_on_passported_benefits:
+            yield IncomeForm
+            yield OutgoingsForm
+
+    def shadow_result(self, row):
+        session.clear()
+        for form_class in self.relevant_forms():
+            form = form_class(formdata=posted(form_data(form_class, row)))
+            session.checker[form_class.__name__] = dict(form.data, is_completed=True)
+
+        means_test = MeansTest()
+        means_test.update_from_session()
+        return ShadowEligibilityCalculator(means_test).is_eligible()
+
+    def test_agrees_with_spreadsheet(self):
+        expected_results = {"P": ELIGIBILITY_STATES.YES, "F": ELIGIBILITY_STATES.NO}
+        for row in spreadsheet():
+            if not is_test(row) or row.get("_actual") not in expected_results:
+                continue
+            result = self.shadow_result(row)
+            if result is not None:
+                self.assertEqual(
+                    expected_results[row["_actual"]],
+                    result,
+                    "Line {0}: {1}".format(row["line_number"], row.get("_description")),
+                )
@@ -1,10 +1,12 @@
 import os
+import shutil
+import tempfile
 from wtforms import StringField
 from flask_wtf import Form
 from mock import patch
 
 from cla_public.apps.checker.fields import DescriptionRadioField
-from cla_public.libs.form_config_parser import ConfigFormMixin
+from cla_public.libs.form_config_parser import ConfigFormMixin, compile_form_config, load_form_config
 from cla_public.apps.base.tests import FlaskAppTestCase
 
 
@@ -67,3 +69,21 @@ class TestFormConfig(FlaskAppTestCase):
                     "<h1>Heading for Debt Markdown</h1>\n\n<ul>\n<li>List"
                     " One</li>\n<li>Lisr Two</li>\n</ul>\n\n<p>Standard text</p>\n",
                 )
+
+    def test_config_compiled_once(self):
+        with patch.dict("cla_public.libs.form_config_parser._compiled", clear=True):
+            with patch("cla_public.libs.form_config_parser.compile_form_config", wraps=compile_form_config) as compile:
+                TestConfigForm(config_path=FORMS_CONFIG_PATH)
+                form = TestConfigForm(config_path=FORMS_CONFIG_PATH)
+        self.assertEquals(1, compile.call_count)
+        self.assertEquals(form._fields["text_field"].more_info, "<p>Test text.\"'][;df;lgds'fl''das</p>\n")
+
+    def test_compiled_config_cached_on_disk(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        self.app.config["FORM_CONFIG_CACHE_DIR"] = cache_dir
+        mtime = os.path.getmtime(FORMS_CONFIG_PATH)
+        config = load_form_config(FORMS_CONFIG_PATH, mtime)
+        with patch("cla_public.libs.form_config_parser.compile_form_config") as compile:
+            self.assertEquals(config, load_form_config(FORMS_CONFIG_PATH, mtime))
+        self.assertFalse(compile.called)
@@ -1,11 +1,13 @@
 from collections import defaultdict
 from itertools import chain
 import logging
+import unittest
+from mock import patch
 
 from flask import session
 
 from cla_public.apps.checker.constants import YES, NO
-from cla_public.apps.checker.means_test import MeansTest
+from cla_public.apps.checker.means_test import MeansTest, recursive_update
 from cla_public.libs.money_interval import MoneyInterval
 from cla_public.apps.base.tests import FlaskAppTestCase
 
@@ -572,3 +574,95 @@ class TestMeansTest(FlaskAppTestCase):
         self.assertEqual(MoneyInterval(500), mt["partner"]["income"]["maintenance_received"])
         self.assertEqual(MoneyInterval(600), mt["partner"]["income"]["pension"])
         self.assertEqual(MoneyInterval(700), mt["partner"]["income"]["other_income"])
+
+    def test_session_fragments_reused(self):
+        update_session("AboutYouForm", **about_you_post_data(have_savings=YES))
+        update_session("SavingsForm", savings=100000, investments=0, valuables=None)
+        with patch.object(MeansTest, "payload", wraps=MeansTest.payload) as payload:
+            MeansTest().update_from_session()
+            session.checker["SavingsForm"] = dict(session.checker["SavingsForm"], savings=200000)
+            mt = MeansTest()
+            mt.update_from_session()
+
+        built = [args[0] for args, kwargs in payload.call_args_list]
+        self.assertEqual(["AboutYouForm", "SavingsForm", "SavingsForm"], built)
+        self.assertEqual(200000, mt["you"]["savings"]["bank_balance"])
+
+    def test_session_fragments_follow_forms_they_read(self):
+        update_session("AboutYouForm", **about_you_post_data(have_savings=YES))
+        update_session("SavingsForm", savings=100000, investments=0, valuables=None)
+        MeansTest().update_from_session()
+
+        session.checker["AboutYouForm"] = about_you_post_data(have_savings=NO)
+        mt = MeansTest()
+        mt.update_from_session()
+        self.assertEqual(0, mt["you"]["savings"]["bank_balance"])
+
+    @patch("cla_public.apps.checker.means_test.get_api_connection")
+    def test_save_patches_only_changed_subtrees(self, mock_connection):
+        backend = mock_connection.return_value
+        backend.eligibility_check.post.return_value = {"reference": "ref"}
+
+        mt = MeansTest()
+        mt.save()
+        self.assertTrue(backend.eligibility_check.post.called)
+
+        mt = MeansTest()
+        mt.update({"dependants_young": 2})
+        mt.save()
+        patch_call = backend.eligibility_check.return_value.patch
+        patch_call.assert_called_once_with({"dependants_young": 2})
+
+    @patch("cla_public.apps.checker.means_test.get_api_connection")
+    def test_save_skipped_when_unchanged(self, mock_connection):
+        backend = mock_connection.return_value
+        backend.eligibility_check.post.return_value = {"reference": "ref"}
+
+        MeansTest().save()
+        MeansTest().save()
+        self.assertFalse(backend.eligibility_check.return_value.patch.called)
+
+    @patch("cla_public.apps.checker.means_test.get_api_connection")
+    def test_save_sends_everything_for_new_reference(self, mock_connection):
+        backend = mock_connection.return_value
+        backend.eligibility_check.post.return_value = {"reference": "ref"}
+        MeansTest().save()
+
+        session.checker["eligibility_check"] = "other-ref"
+        mt = MeansTest()
+        mt.save()
+        backend.eligibility_check.return_value.patch.assert_called_once_with(dict(mt))
+
+    @patch("cla_public.apps.checker.means_test.get_api_connection")
+    def test_save_sends_everything_when_key_removed(self, mock_connection):
+        backend = mock_connection.return_value
+        backend.eligibility_check.post.return_value = {"reference": "ref"}
+        mt = MeansTest()
+        mt["partner"] = {"income": {}}
+        mt.save()
+
+        mt = MeansTest()
+        mt.save()
+        backend.eligibility_check.return_value.patch.assert_called_once_with(dict(mt))
+
+
+class TestRecursiveUpdate(unittest.TestCase):
+    def test_missing_keys_copied(self):
+        other = {"you": {"income": {}}, "properties": [{"value": 1}]}
+        orig = recursive_update({}, other)
+        self.assertEqual(other, orig)
+        self.assertIsNot(other["properties"], orig["properties"])
+
+    def test_notes_appended(self):
+        self.assertEqual({"notes": "a\n\nb"}, recursive_update({"notes": "a"}, {"notes": "b"}))
+
+    def test_mappings_merged(self):
+        orig = {"you": {"income": {"earnings": MoneyInterval(100)}, "savings": None}, "benefits": {"a": 1}}
+        other = {
+            "you": {"income": {"earnings": post_money_interval("2")}, "savings": {"bank_balance": 3}},
+            "benefits": {},
+        }
+        orig = recursive_update(orig, other)
+        self.assertEqual(MoneyInterval(200), orig["you"]["income"]["earnings"])
+        self.assertEqual({"bank_balance": 3}, orig["you"]["savings"])
+        self.assertEqual({"a": 1}, orig["benefits"])
@@ -0,0 +1,72 @@
+# coding: utf-8
+import unittest
+
+from cla_public.apps.checker.api import FINANCES as CHECK_FINANCES, initialise_eligibility_check
+from cla_public.apps.checker.constants import NO
+from cla_public.apps.checker.means_test import FINANCES
+from cla_public.apps.checker.payload_schema import Amount, Field, Money, Schema
+from cla_public.libs.money_interval import MoneyInterval
+
+
+class TestPayloadSchema(unittest.TestCase):
+    def setUp(self):
+        self.schema = Schema(
+            Money("income.earnings", "earnings"),
+            Money("income.self_employment_drawings"),
+            Amount("savings.bank_balance", "savings"),
+            Field("disputed", "in_dispute"),
+            Field("specific_benefits", default=dict),
+        )
+
+    def test_build(self):
+        form_data = {
+            "your_income-earnings-per_interval_value": "10.50",
+            "your_income-earnings-interval_period": "per_week",
+            "your_income-savings": "1,000",
+            "your_income-in_dispute": "1",
+        }
+        payload = self.schema.build(form_data, "your_income-")
+        self.assertEqual(MoneyInterval(1050, "per_week"), payload["income"]["earnings"])
+        self.assertEqual(MoneyInterval(0), payload["income"]["self_employment_drawings"])
+        self.assertEqual(100000, payload["savings"]["bank_balance"])
+        self.assertEqual("1", payload["disputed"])
+        self.assertEqual({}, payload["specific_benefits"])
+
+    def test_skipped_fields_take_defaults(self):
+        form_data = {"earnings-per_interval_value": "10", "earnings-interval_period": "per_week", "savings": "5"}
+        payload = self.schema.build(form_data, skip=("earnings", "savings"))
+        self.assertEqual(MoneyInterval(0), payload["income"]["earnings"])
+        self.assertEqual(0, payload["savings"]["bank_balance"])
+
+    def test_defaults_are_not_shared(self):
+        first, second = self.schema.defaults(), self.schema.defaults()
+        first["specific_benefits"]["income_support"] = True
+        self.assertEqual({}, second["specific_benefits"])
+
+    def test_under(self):
+        payload = self.schema.under("partner").defaults()
+        self.assertEqual(["partner"], payload.keys())
+        self.assertEqual(MoneyInterval(0), payload["partner"]["income"]["earnings"])
+
+    def test_updated(self):
+        schema = self.schema.updated(Amount("income.earnings", "earnings"), Field("notes", default=u""))
+        payload = schema.build({"earnings": "1"})
+        self.assertEqual(100, payload["income"]["earnings"])
+        self.assertEqual(u"", payload["notes"])
+        self.assertEqual(len(self.schema.fields) + 1, len(schema.fields))
+
+    def test_means_test_finances_follow_eligibility_check(self):
+        check_paths = set(field.path for field in CHECK_FINANCES.fields)
+        self.assertEqual(check_paths, set(field.path for field in FINANCES.fields))
+        self.assertEqual(NO, FINANCES.defaults()["income"]["self_employed"])
+
+    def test_initialise_eligibility_check_keeps_values(self):
+        check = initialise_eligibility_check(
+            {"you": {"income": {"earnings": MoneyInterval(100)}}, "dependants_old": 2}
+        )
+        self.assertEqual(MoneyInterval(100), check["you"]["income"]["earnings"])
+        self.assertEqual(MoneyInterval(0), check["partner"]["income"]["earnings"])
+        self.assertEqual(0, check["partner"]["savings"]["total"])
+        self.assertFalse(check["you"]["income"]["self_employed"])
+        self.assertEqual(2, check["dependants_old"])
+        self.assertEqual(0, check["dependants_young"])
@@ -3,9 +3,11 @@ import logging
 import unittest
 
 from bs4 import BeautifulSoup
+from mock import patch
 
 from cla_public.app import create_app
 from cla_public.apps.checker.constants import YES, NO
+from cla_public.apps.checker.views import CheckerStep
 
 
 logging.getLogger("MARKDOWN").setLevel(logging.WARNING)
@@ -88,3 +90,38 @@ class TestReviewPage(unittest.TestCase):
         self.set_problem("debt")
         self.set_about_you_answers(have_children=NO, num_children=1)
         self.assert_answer_not_shown("num_children")
+
+    def test_step_summaries_reused(self):
+        self.set_problem("debt")
+        self.set_about_you_answers(on_benefits=YES)
+        self.set_benefits(passported=False)
+        self.client.get("/review")
+        with patch.object(CheckerStep, "summarise") as summarise:
+            self.client.get("/review")
+        self.assertFalse(summarise.called)
+
+    def test_step_summary_follows_answers(self):
+        self.set_problem("debt")
+        self.set_about_you_answers(on_benefits=YES)
+        self.set_benefits(passported=False)
+        self.client.get("/review")
+        self.set_about_you_answers(on_benefits=YES, have_children=YES)
+        with patch.object(CheckerStep, "summarise", return_value=[]) as summarise:
+            self.client.get("/review")
+        self.assertTrue(summarise.called)
+
+    def test_answers_escaped(self):
+        self.set_problem("debt")
+        self.set_about_you_answers(on_benefits=YES)
+        summary = [{"label": u"Children", "id": "num_children", "ignored": False, "answer": u"<b>2</b>"}]
+        with patch.object(CheckerStep, "summarise", return_value=summary):
+            html = self.review_page_html
+        self.assertNotIn("<b>2</b>", html)
+        self.assertIn("&lt;b&gt;2&lt;/b&gt;", html)
+
+    def test_step_summaries_not_shared(self):
+        self.set_problem("debt")
+        self.set_about_you_answers(on_benefits=YES)
+        with patch.object(self.client.application.cache, "set") as shared_set:
+            self.client.get("/review")
+        self.assertFalse(shared_set.called)
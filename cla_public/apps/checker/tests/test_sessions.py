@@ -1,12 +1,27 @@
+import time
 import unittest
 import uuid
-from flask import json
+from mock import Mock, patch
+from flask import json, session
 from base64 import b64encode
 from flask._compat import text_type
-from werkzeug.http import http_date
-from datetime import datetime
+from werkzeug.contrib.cache import SimpleCache
+from werkzeug.http import http_date, parse_date
+from datetime import datetime, timedelta
+from cla_public.apps.base.tests import FlaskAppTestCase
+from cla_public.apps.checker.constants import NO, YES
 from cla_public.apps.checker.means_test import MeansTest
-from cla_public.apps.checker.session import CheckerTaggedJSONSerializer, CheckerSessionObject
+from cla_public.apps.checker.session import (
+    CheckerSession,
+    CheckerTaggedJSONSerializer,
+    CheckerSessionObject,
+    LegacyCheckerTaggedJSONSerializer,
+    ServerSideCheckerSessionInterface,
+    create_session_interface,
+)
+from cla_public.libs import metrics
+from cla_public.libs.benchmarks import session_snapshot
+from cla_public.libs.money_interval import MoneyInterval
 
 
 class TestCheckerSession(unittest.TestCase):
@@ -225,3 +240,265 @@ class TestCheckerSession(unittest.TestCase):
         expectedJSON = self.format_json(expectedValue)
         self.assert_json(outputJSON)
         self.assertEqual(outputJSON, expectedJSON)
+
+
+class TestDerivedProperties(unittest.TestCase):
+    def test_recomputed_after_change(self):
+        checker = CheckerSessionObject(AboutYouForm={"on_benefits": YES})
+        checker["YourBenefitsForm"] = {"benefits": ["other-benefit"]}
+        self.assertFalse(checker.is_on_passported_benefits)
+
+        checker["YourBenefitsForm"] = {"benefits": ["income_support"]}
+        self.assertTrue(checker.is_on_passported_benefits)
+
+        checker.update(AboutYouForm={"on_benefits": NO})
+        self.assertFalse(checker.is_on_passported_benefits)
+
+    def test_memoized(self):
+        checker = CheckerSessionObject()
+        compute = Mock(return_value=["about"])
+        checker.memoized("steps", compute)
+        self.assertEqual(["about"], checker.memoized("steps", compute))
+        self.assertEqual(1, compute.call_count)
+
+        checker["category"] = "debt"
+        checker.memoized("steps", compute)
+        self.assertEqual(2, compute.call_count)
+
+
+class TestSerializerCompatibility(FlaskAppTestCase):
+    def test_same_format_as_legacy_serializer(self):
+        snapshot = session_snapshot()
+        serializer = CheckerTaggedJSONSerializer()
+        legacy = LegacyCheckerTaggedJSONSerializer()
+
+        data = serializer.dumps(snapshot)
+        self.assertEqual(json.loads(legacy.dumps(snapshot)), json.loads(data))
+        self.assertEqual(legacy.loads(data), serializer.loads(data))
+        self.assertIsInstance(serializer.loads(data)["checker"]["means_test"], MeansTest)
+
+    def test_means_test_money_intervals_decoded(self):
+        data = '{" mt":{"you":{"income":{"earnings":{"per_interval_value":1000,"interval_period":"per_week"}}}}}'
+        earnings = CheckerTaggedJSONSerializer().loads(data)["you"]["income"]["earnings"]
+        self.assertIsInstance(earnings, MoneyInterval)
+        self.assertEqual(MoneyInterval(1000, "per_week"), earnings)
+
+
+class TestSessionCookie(FlaskAppTestCase):
+    def setUp(self):
+        super(TestSessionCookie, self).setUp()
+        metrics.reset()
+        self.interface = self.app.session_interface
+        self.snapshot = session_snapshot()
+
+    def test_loads_cookies_from_default_serializer(self):
+        from itsdangerous import URLSafeTimedSerializer
+
+        serializer = self.interface.get_signing_serializer(self.app)
+        default = URLSafeTimedSerializer(
+            self.app.secret_key,
+            salt=self.interface.salt,
+            serializer=self.interface.serializer,
+            signer_kwargs=dict(key_derivation="hmac", digest_method=self.interface.digest_method),
+        )
+        cookie = default.dumps(self.snapshot)
+        self.assertTrue(cookie.startswith("."))
+        self.assertEqual(default.loads(cookie), serializer.loads(cookie))
+        self.assertEqual(default.loads(cookie), default.loads(serializer.dumps(self.snapshot)))
+
+    def test_oversized_cookie_recorded(self):
+        cookie = self.interface.get_signing_serializer(self.app).dumps(self.snapshot)
+        self.interface.check_cookie_size(self.app, session, cookie)
+        self.assertEqual(0, metrics.get("session.oversized"))
+
+        self.app.config["SESSION_COOKIE_SIZE_BUDGET"] = len(cookie) - 1
+        self.interface.check_cookie_size(self.app, session, cookie)
+        self.assertEqual(1, metrics.get("session.oversized"))
+
+
+class TestUnchangedSessionNotResent(FlaskAppTestCase):
+    def setUp(self):
+        super(TestUnchangedSessionNotResent, self).setUp()
+        metrics.reset()
+        self.client = self.app.test_client()
+        with self.client.session_transaction() as sess:
+            sess.permanent = True
+            sess.checker["category"] = "debt"
+
+    def test_read_only_request_skips_cookie(self):
+        response = self.client.get("/session_keep_alive")
+        self.assertNotIn("Set-Cookie", response.headers)
+        self.assertEqual(1, metrics.get("session.write_skipped"))
+
+    def test_cookie_refreshed_after_interval(self):
+        self.app.config["SESSION_REFRESH_INTERVAL"] = 0
+        response = self.client.get("/session_keep_alive")
+        self.assertIn("Set-Cookie", response.headers)
+
+    def test_session_end_sends_cookie(self):
+        response = self.client.get("/session_end")
+        self.assertIn("Set-Cookie", response.headers)
+
+    def test_untouched_session_not_decoded(self):
+        with patch.object(self.app.session_interface, "load_payload") as load_payload:
+            response = self.client.get("/ping.json")
+        self.assertFalse(load_payload.called)
+        self.assertNotIn("Set-Cookie", response.headers)
+
+    def test_untouched_session_resigned_after_interval(self):
+        self.app.config["SESSION_REFRESH_INTERVAL"] = 0
+        response = self.client.get("/ping.json")
+        self.assertIn("Set-Cookie", response.headers)
+        with self.client.session_transaction() as sess:
+            self.assertEqual("debt", sess.checker["category"])
+
+    def test_untouched_session_resigned_without_decoding(self):
+        self.app.config["SESSION_REFRESH_INTERVAL"] = 0
+        with patch.object(self.app.session_interface, "load_payload") as load_payload:
+            response = self.client.get("/ping.json")
+        self.assertFalse(load_payload.called)
+        cookie = response.headers["Set-Cookie"]
+        self.assertIn("Expires=", cookie)
+        self.assertIn("=!", cookie)
+
+    def test_untouched_session_expiry_moves_forward(self):
+        self.app.config["SESSION_REFRESH_INTERVAL"] = 0
+        self.app.permanent_session_lifetime = timedelta(days=1)
+        response = self.client.get("/ping.json")
+        expires = parse_date(response.headers["Set-Cookie"].split("Expires=")[1].split(";")[0])
+        self.assertGreater(expires, datetime.utcnow() + timedelta(hours=23))
+
+    def test_untouched_browser_session_stays_browser_session(self):
+        with self.client.session_transaction() as sess:
+            sess.permanent = False
+        self.app.config["SESSION_REFRESH_INTERVAL"] = 0
+        with patch.object(self.app.session_interface, "load_payload") as load_payload:
+            response = self.client.get("/ping.json")
+        self.assertFalse(load_payload.called)
+        cookie = response.headers["Set-Cookie"]
+        self.assertNotIn("Expires=", cookie)
+        self.assertIn("=~", cookie)
+
+    def test_cookie_without_marker_decoded_once(self):
+        cookie = next(iter(self.client.cookie_jar))
+        self.assertTrue(cookie.value.startswith("!"))
+        self.client.set_cookie("localhost", self.app.session_cookie_name, cookie.value[1:])
+        self.app.config["SESSION_REFRESH_INTERVAL"] = 0
+        response = self.client.get("/ping.json")
+        cookie = response.headers["Set-Cookie"]
+        self.assertIn("Expires=", cookie)
+        self.assertIn("=!", cookie)
+
+
+class TestDeferredLoad(FlaskAppTestCase):
+    # dict methods which neither read nor write the session data
+    NOT_ACCESSORS = {
+        "__class__",
+        "__delattr__",
+        "__doc__",
+        "__format__",
+        "__getattribute__",
+        "__hash__",
+        "__init__",
+        "__new__",
+        "__reduce__",
+        "__reduce_ex__",
+        "__setattr__",
+        "__sizeof__",
+        "__subclasshook__",
+        "fromkeys",
+    }
+
+    ARGS = {
+        "__cmp__": ({},),
+        "__contains__": ("category",),
+        "__delitem__": ("category",),
+        "__eq__": ({},),
+        "__ge__": ({},),
+        "__getitem__": ("category",),
+        "__gt__": ({},),
+        "__le__": ({},),
+        "__lt__": ({},),
+        "__ne__": ({},),
+        "__setitem__": ("category", "debt"),
+        "get": ("category",),
+        "has_key": ("category",),
+        "pop": ("category",),
+        "setdefault": ("category",),
+        "update": ({},),
+    }
+
+    def deferred_session(self):
+        session = CheckerSession()
+        load_payload = Mock(side_effect=lambda session, payload: dict.update(session, category="debt"))
+        session.defer_load("payload", load_payload)
+        return session, load_payload
+
+    def test_every_accessor_loads(self):
+        for name in set(dir(dict)) - self.NOT_ACCESSORS:
+            session, load_payload = self.deferred_session()
+            if name == "clear":
+                # clearing discards the payload instead
+                with patch.dict(self.app.config, CLEAR_SESSION=True):
+                    session.clear()
+                self.assertFalse(load_payload.called)
+                self.assertTrue(session.is_loaded)
+                continue
+            getattr(session, name)(*self.ARGS.get(name, ()))
+            self.assertTrue(load_payload.called, name)
+            self.assertTrue(session.is_loaded, name)
+
+    def test_permanent_loads(self):
+        session, load_payload = self.deferred_session()
+        self.assertFalse(session.permanent)
+        self.assertTrue(load_payload.called)
+
+        session, load_payload = self.deferred_session()
+        session.permanent = True
+        self.assertTrue(load_payload.called)
+        self.assertEqual("debt", session["category"])
+
+
+class TestServerSideSession(FlaskAppTestCase):
+    def setUp(self):
+        super(TestServerSideSession, self).setUp()
+        self.store = SimpleCache()
+        self.app.session_interface = ServerSideCheckerSessionInterface(self.store)
+        self.client = self.app.test_client()
+
+    def test_cookie_only_carries_session_id(self):
+        with self.client.session_transaction() as sess:
+            sess.checker["category"] = "debt"
+            sess.checker["notes"] = "x" * 5000
+
+        cookie = next(iter(self.client.cookie_jar))
+        self.assertLess(len(cookie.value), 200)
+        with self.client.session_transaction() as sess:
+            self.assertEqual("debt", sess.checker["category"])
+
+    def test_session_end_shortens_stored_session(self):
+        self.client.get("/session_keep_alive")
+        with self.client.session_transaction() as sess:
+            sess.checker["category"] = "debt"
+        self.client.get("/session_end")
+
+        key = next(iter(self.store._cache))
+        expires, _ = self.store._cache[key]
+        self.assertLessEqual(expires - time.time(), 20)
+
+    def test_tampered_cookie_starts_new_session(self):
+        with self.client.session_transaction() as sess:
+            sess.checker["category"] = "debt"
+        self.client.set_cookie("localhost", self.app.session_cookie_name, "tampered")
+        with self.client.session_transaction() as sess:
+            self.assertNotIn("category", sess.checker)
+
+    def test_redis_store_needs_url(self):
+        with patch.dict("sys.modules", {"redis": Mock()}):
+            with patch.dict(self.app.config, SESSION_STORE="redis", SESSION_STORE_REDIS_URL=None):
+                self.assertRaises(ValueError, create_session_interface, self.app)
+
+    def test_redis_store_needs_redis_installed(self):
+        with patch.dict("sys.modules", {"redis": None}):
+            with patch.dict(self.app.config, SESSION_STORE="redis", SESSION_STORE_REDIS_URL="redis://localhost"):
+                self.assertRaises(ValueError, create_session_interface, self.app)
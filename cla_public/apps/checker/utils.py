@@ -1,4 +1,5 @@
-from cla_public.apps.checker.constants import PASSPORTED_BENEFITS, NASS_BENEFITS, MONEY_INTERVALS, CATEGORIES
+from cla_public.apps.checker.categories import category_registry
+from cla_public.apps.checker.constants import PASSPORTED_BENEFITS, NASS_BENEFITS, MONEY_INTERVALS
 
 
 def passported(benefits):
@@ -20,7 +21,9 @@ def money_intervals(*fields):
 
 
 def category_option_from_name(category_name):
-    def requested(category_tuple):
-        return category_tuple[1] == category_name
-
-    return next(iter(filter(requested, CATEGORIES)), (None, None, None))
+    """
+    The (value, label, help text) option from CATEGORIES for the English
+    `category_name`
+    """
+    category = category_registry.from_name(category_name)
+    return category.option if category else (None, None, None)
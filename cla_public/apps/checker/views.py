@@ -1,22 +1,22 @@
 # coding: utf-8
 "Checker views"
+import hashlib
+import json
 import logging
 
 from cla_common.constants import ELIGIBILITY_REASONS
-from flask import abort, render_template, redirect, session, url_for, views, request
+from flask import abort, current_app, get_template_attribute, render_template, redirect, session, url_for, views, request
 from flask.ext.babel import lazy_gettext as _
 from wtforms.validators import StopValidation
 
 from cla_public.apps.checker import checker
 from cla_public.apps.checker.api import get_organisation_list
 from cla_public.apps.checker.forms import FindLegalAdviserForm
-from cla_public.apps.checker.utils import category_option_from_name
+from cla_public.apps.checker.categories import category_registry
 from cla_public.apps.contact.forms import ContactForm
 from cla_public.apps.checker.constants import (
-    ORGANISATION_CATEGORY_MAPPING,
     NO_CALLBACK_CATEGORIES,
     LAALAA_PROVIDER_CATEGORIES_MAP,
-    CATEGORIES,
 )
 from cla_public.apps.checker.forms import (
     AboutYouForm,
@@ -32,13 +32,16 @@ from cla_public.apps.checker.constants import CATEGORY_ID_MAPPING
 from cla_public.apps.checker.means_test import MeansTest, MeansTestError
 from cla_public.apps.checker.validators import IgnoreIf
 from cla_public.apps.checker import filters  # noqa: F401
-from cla_public.libs.utils import override_locale, category_id_to_name
+from cla_public.libs.ttl_cache import app_cache
+from cla_public.libs.utils import get_locale, category_id_to_name
 from cla_public.libs.views import AllowSessionOverride, FormWizard, FormWizardStep, RequiresSession, HasFormMixin
 from cla_public.libs import laalaa, honeypot
 from cla_public.apps.checker.cait_intervention import get_cait_params
 
 log = logging.getLogger(__name__)
 
+DEFAULT_REVIEW_SUMMARY_CACHE = {"maxsize": 1024, "ttl": 60 * 60}
+
 
 @checker.after_request
 def add_header(response):
@@ -84,10 +87,39 @@ def is_null(field):
     return False
 
 
+def shown_in_property(field):
+    data = field.data
+    return not (isinstance(data, dict) and "per_interval_value" in data and data["per_interval_value"] is None)
+
+
+def review_summary_cache():
+    """
+    Per-worker cache of review summaries. They hold users' answers, so they
+    are kept out of the shared app cache.
+    """
+    config = dict(DEFAULT_REVIEW_SUMMARY_CACHE)
+    config.update(current_app.config.get("REVIEW_SUMMARY_CACHE", {}))
+    return app_cache("review_summary_cache", config["maxsize"], config["ttl"])
+
+
+def review_summary_key(form_name):
+    """
+    Cache key for a step's review summary. Besides the step's own answers,
+    the About you answers decide which fields a form has and their labels.
+    """
+    answers = json.dumps(
+        [session.checker.get(form_name), session.checker.get("AboutYouForm")], sort_keys=True, default=unicode
+    )
+    return "review_summary:{form}:{locale}:{digest}".format(
+        form=form_name, locale=get_locale(), digest=hashlib.sha1(answers).hexdigest()
+    )
+
+
 class CheckerStep(UpdatesMeansTest, FormWizardStep):
-    def completed_fields(self):
-        session_data = session.checker.get(self.form_class.__name__, {})
-        form = self.form_class(**session_data)
+    def completed_fields(self, form=None):
+        if form is None:
+            session_data = session.checker.get(self.form_class.__name__, {})
+            form = self.form_class(**session_data)
 
         def user_completed(field):
             name, field = field
@@ -115,6 +147,54 @@ class CheckerStep(UpdatesMeansTest, FormWizardStep):
         fields = map(lambda (name, field): (field), fields)
         return fields
 
+    def summarise(self, form=None):
+        """
+        What the review page shows for this step: the label, id and rendered
+        answer of each field, with `ignored` set for fields it leaves out
+        """
+        render_answer = get_template_attribute("macros/review.html", "render_answer")
+
+        def row(field):
+            # the macro escapes the answer, and the Markup it returns is kept
+            # so the review page does not escape it again
+            return {"label": unicode(field.label.text), "id": field.id, "answer": render_answer(field, None)}
+
+        def entry(field, completed):
+            summary = {"label": unicode(field.label.text), "id": field.id, "ignored": not completed}
+            if not completed:
+                return summary
+            if "Property" in field.type:
+                summary["properties"] = [
+                    [row(f) for f in p.form._fields.values() if shown_in_property(f)] for p in field
+                ]
+            elif "Income" in field.type:
+                summary["rows"] = [row(f) for f in field.form._fields.values()]
+            else:
+                summary["answer"] = row(field)["answer"]
+            return summary
+
+        if form is None:
+            form = self.form_class(**session.checker.get(self.form_class.__name__, {}))
+        completed = set(field.name for field in self.completed_fields(form))
+        return [
+            entry(field, name in completed)
+            for name, field in form._fields.items()
+            if name not in ("csrf_token", honeypot.FIELD_NAME)
+        ]
+
+    def review_summary(self, form=None):
+        """
+        The step's summary for the review page, computed once for each set of
+        answers and locale
+        """
+        cache = review_summary_cache()
+        key = review_summary_key(self.form_class.__name__)
+        summary = cache.get(key)
+        if summary is None:
+            summary = self.summarise(form)
+            cache.set(key, summary)
+        return summary
+
     @property
     def is_completed(self):
         return session.checker.get(self.form_class.__name__, {}).get("is_completed", False)
@@ -128,14 +208,14 @@ class CheckerStep(UpdatesMeansTest, FormWizardStep):
 
     @property
     def count(self):
-        steps = CheckerWizard("").relevant_steps[:-1]
+        steps = self.wizard.relevant_steps[:-1]
         for index, item in enumerate(steps):
             if item.name == self.name:
                 return index + 1
         return None
 
     def render(self, *args, **kwargs):
-        steps = CheckerWizard("").relevant_steps[:-1]
+        steps = self.wizard.relevant_steps[:-1]
         current_step = None
         if self.count:
             current_step = steps[self.count - 1]
@@ -146,11 +226,11 @@ class CheckerStep(UpdatesMeansTest, FormWizardStep):
 class ReviewStep(CheckerStep):
     @property
     def count(self):
-        steps = CheckerWizard("").relevant_steps[:-1]
+        steps = self.wizard.relevant_steps[:-1]
         return len(steps) + 1
 
     def render(self, *args, **kwargs):
-        review_steps = CheckerWizard("").review_steps
+        review_steps = self.wizard.review_steps
         current_step = self
         return render_template(
             self.template, steps=review_steps, review_steps=review_steps, current_step=current_step, form=self.form
@@ -169,13 +249,27 @@ class CheckerWizard(AllowSessionOverride, FormWizard):
         ("review", ReviewStep(ReviewForm, "checker/review.html")),
     ]
 
+    def save_form_data_in_session(self):
+        super(CheckerWizard, self).save_form_data_in_session()
+        # summarise the answers for the review page while the form is at hand
+        if hasattr(self.step, "review_summary"):
+            self.step.review_summary(self.form)
+
+    def plan(self, name, include):
+        """
+        The steps passing `include`, worked out once until the checker
+        session changes
+        """
+        names = session.checker.memoized(name, lambda: [s.name for s in self.steps if include(s)])
+        return [self._steps[step_name] for step_name in names]
+
     @property
     def relevant_steps(self):
-        return filter(lambda s: not self.skip(s), self.steps)
+        return self.plan("relevant_steps", lambda s: not self.skip(s))
 
     @property
     def review_steps(self):
-        return filter(lambda s: not self.skip_on_review(s), self.steps)
+        return self.plan("review_steps", lambda s: not self.skip_on_review(s))
 
     def complete(self):
         # TODO: Is this still used now that scope diagnosis is taking care of F2F redirects for certain categories?
@@ -206,7 +300,7 @@ class CheckerWizard(AllowSessionOverride, FormWizard):
         if step.name == "review":
             return False
 
-        if not for_review_page and step.name not in ("about", "benefits") and session.checker.ineligible:
+        if not for_review_page and step.name not in ("about", "benefits") and session.checker.interim_ineligible:
             return True
 
         if step.name == "benefits":
@@ -376,19 +470,12 @@ class HelpOrganisations(views.MethodView):
     _template = "checker/result/ineligible.html"
 
     def get_context(self, category_name, diagnosis_previous_choices):
-        category_name = category_name.replace("-", " ").capitalize()
-
-        # force english as knowledge base languages are in english
-        with override_locale("en"):
-            category, name, desc = category_option_from_name(category_name)
-
-            if category is None:
-                abort(404)
-
-            name = unicode(name)
+        category = category_registry.from_slug(category_name)
+        if category is None:
+            abort(404)
 
-            category_name = ORGANISATION_CATEGORY_MAPPING.get(name, name)
-        trans_category_name = next(c[1] for c in CATEGORIES if c[0] == category)
+        # knowledge base categories are in english
+        category_name = category.organisation_name
 
         ineligible_reasons = session.stored.get("ineligible_reasons", [])
 
@@ -396,8 +483,8 @@ class HelpOrganisations(views.MethodView):
 
         params = {
             "organisations": organisations,
-            "category": category,
-            "category_name": trans_category_name,
+            "category": category.id,
+            "category_name": category.translated_name(get_locale()),
             "ELIGIBILITY_REASONS": ELIGIBILITY_REASONS,
             "ineligible_reasons": ineligible_reasons,
             "truncate": 5,
@@ -433,11 +520,11 @@ def interstitial():
         return redirect(url_for("base.session_expired"))
 
     category = CATEGORY_ID_MAPPING.get(session.checker.category, session.checker.category)
-    category_name = session.checker.category_name
-    with override_locale("en"):
-        category_name_english = unicode(session.checker.category_name)
+    selected = category_registry.get(session.checker.category)
+    category_name = selected.translated_name(get_locale()) if selected else None
+    english_name = selected.name if selected else None
 
-    organisations = get_organisation_list(article_category__name=category_name_english)
+    organisations = get_organisation_list(article_category__name=english_name)
 
     context = {"category": category, "category_name": category_name, "organisations": organisations}
     return render_template("interstitial.html", **context)
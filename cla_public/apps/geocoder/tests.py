@@ -1,7 +1,9 @@
 import json
+import threading
+import time
 
 import mock
-from cla_public.apps.geocoder.views import geocode
+from cla_public.apps.geocoder.views import geocode, lookup_addresses
 from cla_public.apps.base.tests import FlaskAppTestCase
 
 
@@ -19,3 +21,40 @@ class GeocoderTest(FlaskAppTestCase):
             mock_method.return_value = [self.prerecorded_result]
             response = geocode(postcode="MOOT")
             self.assertEqual(expected_formatted_result, response.data)
+
+    def test_lookups_cached_by_normalised_postcode(self):
+        with mock.patch("cla_common.address_lookup.ordnance_survey.FormattedAddressLookup.by_postcode") as mock_method:
+            mock_method.return_value = [self.prerecorded_result]
+            geocode(postcode="sw1h 9ag")
+            response = geocode(postcode="SW1H9AG")
+            self.assertEqual(1, mock_method.call_count)
+            self.assertIn(self.prerecorded_result, json.loads(response.data)[0]["formatted_address"])
+
+    def test_etag_revalidation(self):
+        client = self.app.test_client()
+        with mock.patch("cla_common.address_lookup.ordnance_survey.FormattedAddressLookup.by_postcode") as mock_method:
+            mock_method.return_value = [self.prerecorded_result]
+            response = client.get("/addresses/SW1H9AG")
+            etag = response.headers["ETag"]
+            self.assertIn("max-age", response.headers["Cache-Control"])
+
+            response = client.get("/addresses/SW1H9AG", headers={"If-None-Match": etag})
+            self.assertEqual(304, response.status_code)
+
+    def test_concurrent_lookups_collapsed(self):
+        def by_postcode(postcode):
+            time.sleep(0.05)
+            return [self.prerecorded_result]
+
+        def lookup():
+            with self.app.app_context():
+                lookup_addresses("SW1H9AG")
+
+        with mock.patch("cla_common.address_lookup.ordnance_survey.FormattedAddressLookup.by_postcode") as mock_method:
+            mock_method.side_effect = by_postcode
+            threads = [threading.Thread(target=lookup) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(1, mock_method.call_count)
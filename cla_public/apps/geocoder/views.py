@@ -5,17 +5,55 @@ import json
 import logging
 
 from cla_common.address_lookup.ordnance_survey import FormattedAddressLookup
-from flask import Response, current_app
+from flask import Response, current_app, request
 
 from cla_public.apps.geocoder import geocoder
+from cla_public.libs.ttl_cache import SingleFlight, app_cache
+from cla_public.libs.utils import normalise_postcode
 
 log = logging.getLogger(__name__)
 
+DEFAULT_CACHE = {"maxsize": 1024, "ttl": 24 * 60 * 60, "negative_ttl": 5 * 60}
+
+lookups = SingleFlight()
+
+
+def cache_config():
+    config = dict(DEFAULT_CACHE)
+    config.update(current_app.config.get("GEOCODER_CACHE", {}))
+    return config
+
+
+def lookup_addresses(postcode):
+    """
+    Formatted addresses for a normalised postcode, cached per worker.
+    Concurrent lookups of the same postcode share one call to OS Places.
+    """
+    config = cache_config()
+    cache = app_cache("geocoder_cache", config["maxsize"], config["ttl"])
+    addresses = cache.get(postcode)
+    if addresses is None:
+
+        def lookup():
+            key = current_app.config.get("OS_PLACES_API_KEY")
+            formatted_addresses = FormattedAddressLookup(key=key).by_postcode(postcode)
+            result = [address for address in formatted_addresses if address]
+            # an empty result may be an upstream failure so don't keep it long
+            cache.set(postcode, result, ttl=None if result else config["negative_ttl"])
+            return result
+
+        addresses = lookups.do(postcode, lookup)
+    return addresses
+
 
 @geocoder.route("/addresses/<postcode>", methods=["GET"])
 def geocode(postcode):
     """Lookup addresses with the specified postcode"""
-    key = current_app.config.get("OS_PLACES_API_KEY")
-    formatted_addresses = FormattedAddressLookup(key=key).by_postcode(postcode)
-    response = [{"formatted_address": address} for address in formatted_addresses if address]
-    return Response(json.dumps(response), mimetype="application/json")
+    addresses = lookup_addresses(normalise_postcode(postcode))
+    response = Response(
+        json.dumps([{"formatted_address": address} for address in addresses]), mimetype="application/json"
+    )
+    response.add_etag()
+    response.cache_control.private = True
+    response.cache_control.max_age = cache_config()["ttl"] if addresses else 0
+    return response.make_conditional(request)
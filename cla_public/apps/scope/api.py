@@ -1,11 +1,11 @@
 # coding: utf-8
 import urllib
 from cla_common.constants import DIAGNOSIS_SCOPE
-import requests
 from cla_public.apps.checker.api import post_to_eligibility_check_api
 from cla_public.apps.checker.constants import CATEGORY_ID_MAPPING, F2F_CATEGORIES
 from cla_public.apps.checker.utils import category_option_from_name
-from cla_public.libs.utils import get_locale, override_locale
+from cla_public.libs.http_session import get_http_session
+from cla_public.libs.utils import get_locale
 from flask import current_app, request, session, Markup
 from flask.ext.babel import gettext
 
@@ -38,7 +38,7 @@ class DiagnosisApiClient(object):
     def post_to_scope(self, path="", payload={}):
         request_args = self.request_args()
         request_args["json"] = payload
-        return requests.post(self.request_path(path), **request_args)
+        return get_http_session().post(self.request_path(path), **request_args)
 
     def create_diagnosis(self):
         if not session.checker.get(REF_KEY):
@@ -74,7 +74,7 @@ class DiagnosisApiClient(object):
         session.checker[PREV_KEY] = choices_list
         if len(previous_choices) == len(choices_list):
             # reload page - same choices as before
-            return requests.get(self.request_path(), **self.request_args())
+            return get_http_session().get(self.request_path(), **self.request_args())
 
         steps, direction = self.get_steps_and_direction(previous_choices, choices_list)
 
@@ -87,8 +87,7 @@ class DiagnosisApiClient(object):
         category = response_json["category"]
         if not category:
             category_name = response_json["nodes"][0]["key"]
-            with override_locale("en"):
-                category, name, desc = category_option_from_name(category_name)
+            category, name, desc = category_option_from_name(category_name)
         return category
 
     def save_category(self, category):
@@ -48,6 +48,28 @@ SESSION_COOKIE_SECURE = True
 
 PERMANENT_SESSION_LIFETIME = datetime.timedelta(minutes=5)
 
+# zlib level used when compressing the session cookie
+SESSION_COOKIE_COMPRESSION_LEVEL = int(os.environ.get("SESSION_COOKIE_COMPRESSION_LEVEL", 9))
+
+# Session cookies larger than this many bytes are logged, leaving room for
+# the cookie attributes within the 4096 byte browser limit
+SESSION_COOKIE_SIZE_BUDGET = int(os.environ.get("SESSION_COOKIE_SIZE_BUDGET", 3800))
+
+# Unchanged sessions are only re-sent once the cookie is this many seconds
+# old, which is how late the session expiry can slide
+SESSION_REFRESH_INTERVAL = int(os.environ.get("SESSION_REFRESH_INTERVAL", 60))
+
+# Where the checker session lives: "cookie", or on the server in
+# "filesystem" (single node) or "redis" (several nodes) with only a signed
+# session id in the cookie
+SESSION_STORE = os.environ.get("SESSION_STORE", "cookie")
+SESSION_STORE_DIR = os.environ.get("SESSION_STORE_DIR", "/tmp/cla_public_sessions")
+# Once the "filesystem" store holds more sessions than this it deletes some
+# whether or not they have expired, logging those users out. Set it well
+# above the sessions started within PERMANENT_SESSION_LIFETIME at peak.
+SESSION_STORE_THRESHOLD = int(os.environ.get("SESSION_STORE_THRESHOLD", 50000))
+SESSION_STORE_REDIS_URL = os.environ.get("SESSION_STORE_REDIS_URL")
+
 APP_SETTINGS = {
     "app_title": _("Check if you can get legal aid"),
     "proposition_title": _("Check if you can get legal aid"),
@@ -58,6 +80,29 @@ API_CLIENT_TIMEOUT = 10
 
 BACKEND_API = {"url": "{url}/checker/api/v1/".format(url=BACKEND_BASE_URI)}
 
+# Pooled keep-alive session shared by all outbound API calls in a worker.
+# Only failures to connect are retried, for any method, as the request was
+# never sent. Read failures are not retried, so writes are never resent.
+HTTP_CLIENT = {
+    "pool_connections": int(os.environ.get("HTTP_POOL_CONNECTIONS", 10)),
+    "pool_maxsize": int(os.environ.get("HTTP_POOL_MAXSIZE", 10)),
+    "pool_block": os.environ.get("HTTP_POOL_BLOCK", "False") == "True",
+    "keep_alive": True,
+    "retries": {
+        "total": int(os.environ.get("HTTP_RETRIES", 2)),
+        "connect": int(os.environ.get("HTTP_RETRIES", 2)),
+        "read": 0,
+        "backoff_factor": 0.1,
+        "status_forcelist": [],
+    },
+    # Per-host connection limits, eg. {"https://prod.laalaa.dsd.io": 4}
+    "host_pool_maxsize": {},
+}
+
+# Overrides for the thresholds the in-process shadow eligibility calculator
+# uses to decide obvious outcomes, see apps/checker/eligibility_calculator.py
+ELIGIBILITY_THRESHOLDS = {}
+
 POSTCODEINFO_API = {
     "auth_token": os.environ.get("POSTCODEINFO_API_TOKEN"),
     "api_url": os.environ.get("POSTCODEINFO_API_URL"),
@@ -66,6 +111,34 @@ POSTCODEINFO_API = {
 
 OS_PLACES_API_KEY = os.environ.get("OS_PLACES_API_KEY")
 
+# Address lookups cached per worker, ttl values in seconds.
+# Postcodes with no addresses are cached for negative_ttl.
+GEOCODER_CACHE = {
+    "maxsize": int(os.environ.get("GEOCODER_CACHE_MAXSIZE", 1024)),
+    "ttl": int(os.environ.get("GEOCODER_CACHE_TTL", 24 * 60 * 60)),
+    "negative_ttl": int(os.environ.get("GEOCODER_CACHE_NEGATIVE_TTL", 5 * 60)),
+}
+
+# Rendered static and error pages cached per worker, ttl in seconds
+PAGE_CACHE = {
+    "maxsize": int(os.environ.get("PAGE_CACHE_MAXSIZE", 128)),
+    "ttl": int(os.environ.get("PAGE_CACHE_TTL", 60 * 60)),
+}
+
+# Means test payload fragments cached per worker by the digest of the
+# session data they are built from, ttl in seconds
+PAYLOAD_FRAGMENT_CACHE = {
+    "maxsize": int(os.environ.get("PAYLOAD_FRAGMENT_CACHE_MAXSIZE", 2048)),
+    "ttl": int(os.environ.get("PAYLOAD_FRAGMENT_CACHE_TTL", 30 * 60)),
+}
+
+# Review page summaries of each step's answers cached per worker, ttl in
+# seconds. They hold users' answers so are never put in the shared cache.
+REVIEW_SUMMARY_CACHE = {
+    "maxsize": int(os.environ.get("REVIEW_SUMMARY_CACHE_MAXSIZE", 1024)),
+    "ttl": int(os.environ.get("REVIEW_SUMMARY_CACHE_TTL", 60 * 60)),
+}
+
 ZENDESK_API_USERNAME = os.environ.get("ZENDESK_API_USERNAME")
 ZENDESK_API_TOKEN = os.environ.get("ZENDESK_API_TOKEN")
 ZENDESK_DEFAULT_REQUESTER = 649762516  # anonymous feedback <noreply@ministryofjustice.zendesk.com>
@@ -75,7 +148,22 @@ MOJ_GTM_ID = os.environ.get("MOJ_GTM_ID")
 MOJ_GTM_AUTH = os.environ.get("MOJ_GTM_AUTH")
 MOJ_GTM_PREVIEW = os.environ.get("MOJ_GTM_PREVIEW")
 
-CACHE_TYPE = "simple"
+# Per-worker cache in front of a cache shared by all workers, see
+# cla_public.libs.cache. CACHE_SHARED_TYPE is any Flask-Cache backend, eg.
+# "filesystem", "memcached" or "redis" configured by the CACHE_* settings.
+# Eligibility results are cached by check reference, so only share the cache
+# through a backend as private as the session store. Unset, nothing is shared.
+CACHE_TYPE = "cla_public.libs.cache.two_tier"
+CACHE_SHARED_TYPE = os.environ.get("CACHE_SHARED_TYPE", "null")
+CACHE_DIR = os.environ.get("CACHE_DIR", "/tmp/cla_public_cache")
+CACHE_MEMCACHED_SERVERS = filter(None, os.environ.get("CACHE_MEMCACHED_SERVERS", "").split(","))
+CACHE_REDIS_URL = os.environ.get("CACHE_REDIS_URL")
+CACHE_KEY_PREFIX = "cla_public_"
+CACHE_LOCAL_TIMEOUT = int(os.environ.get("CACHE_LOCAL_TIMEOUT", 30))
+
+# Shared counters use the cache when it is memcached or redis, otherwise
+# flock-protected files in this directory, see cla_public.libs.counters
+COUNTER_DIR = os.environ.get("COUNTER_DIR", "/tmp/cla_public_counters")
 
 EXTENSIONS = []
 
@@ -90,11 +178,35 @@ def config_path(x):
 
 FORM_CONFIG_TRANSLATIONS = {code: config_path(code) for code, label in LANGUAGES}
 
+# Directory for compiled copies of the forms config, shared by all workers;
+# unset compiles the config once per worker
+FORM_CONFIG_CACHE_DIR = os.environ.get("FORM_CONFIG_CACHE_DIR")
+
+# Directory for compiled template bytecode, filled at build time by
+# `python manage.py compile_templates`; unset compiles templates in each worker
+TEMPLATE_CACHE_DIR = os.environ.get("TEMPLATE_CACHE_DIR")
+
 
 TIMEZONE = "Europe/London"
 
 LAALAA_API_HOST = os.environ.get("LAALAA_API_HOST", "https://prod.laalaa.dsd.io")
 
+# Overall deadline in seconds for all the LAALAA searches behind one page
+LAALAA_SEARCH_TIMEOUT = int(os.environ.get("LAALAA_SEARCH_TIMEOUT", 10))
+
+# Legal adviser search results cached per worker, ttl values in seconds.
+# Postcodes LAALAA could not find are cached for negative_ttl.
+LAALAA_CACHE = {
+    "maxsize": int(os.environ.get("LAALAA_CACHE_MAXSIZE", 512)),
+    "ttl": int(os.environ.get("LAALAA_CACHE_TTL", 5 * 60)),
+    "negative_ttl": int(os.environ.get("LAALAA_CACHE_NEGATIVE_TTL", 60)),
+}
+
+# CAIT intervention config is fetched from GitHub in the background once the
+# cached copy, or the last failed fetch, is older than this many seconds
+CAIT_CONFIG_REFRESH_INTERVAL = int(os.environ.get("CAIT_CONFIG_REFRESH_INTERVAL", 5 * 60))
+CAIT_CONFIG_BACKGROUND_REFRESH = True
+
 MAIL_SERVER = os.environ.get("SMTP_HOST")
 MAIL_PORT = os.environ.get("SMTP_PORT", 465)
 MAIL_USE_TLS = False
@@ -13,4 +13,8 @@ LOGGING["loggers"][""]["level"] = "WARNING"  # noqa F405
 
 WTF_CSRF_ENABLED = False
 
+CACHE_SHARED_TYPE = "simple"
+
+CAIT_CONFIG_BACKGROUND_REFRESH = False
+
 LAALAA_API_HOST = os.environ.get("LAALAA_API_HOST", "http://localhost:8001")
@@ -2,6 +2,7 @@ import logging
 import os
 import sys
 import datetime
+import tempfile
 
 from flask import Blueprint, url_for
 from flask.ext.markdown import Markdown
@@ -63,3 +64,49 @@ def change_jinja_templates(app):
         return {"show_covid_availability_times": show_covid_availability_times}
 
     return app
+
+
+class AtomicFileSystemBytecodeCache(jinja2.FileSystemBytecodeCache):
+    """
+    Bytecode cache shared by all workers. Files are written whole, so a
+    worker never loads half written bytecode, and a cache directory which
+    cannot be written to only costs compiling the template again.
+    """
+
+    def dump_bytecode(self, bucket):
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, "wb") as f:
+                bucket.write_bytecode(f)
+            os.rename(tmp, self._get_cache_filename(bucket))
+        except (IOError, OSError):
+            log.warning("Could not cache bytecode for template %s", bucket.key, exc_info=True)
+
+
+def configure_template_cache(app):
+    """
+    Keep compiled templates in TEMPLATE_CACHE_DIR, if set, so new workers
+    load them instead of compiling every template again
+    """
+    cache_dir = app.config.get("TEMPLATE_CACHE_DIR")
+    if not cache_dir:
+        return app
+    if not os.path.isdir(cache_dir):
+        try:
+            os.makedirs(cache_dir)
+        except OSError:
+            if not os.path.isdir(cache_dir):
+                raise
+    app.jinja_env.bytecode_cache = AtomicFileSystemBytecodeCache(cache_dir)
+    return app
+
+
+def compile_templates(app):
+    """
+    Compile every template the app can load, filling the bytecode cache.
+    Returns the names of the templates compiled.
+    """
+    names = app.jinja_env.list_templates()
+    for name in names:
+        app.jinja_env.get_template(name)
+    return names
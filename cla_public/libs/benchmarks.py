@@ -0,0 +1,214 @@
+# coding: utf-8
+"Benchmarks for hot paths, run with `python manage.py benchmark <name>`"
+
+from functools import partial
+import multiprocessing
+import shutil
+import tempfile
+import threading
+import time
+import timeit
+import uuid
+
+from flask import current_app, session
+from flask.ext.cache import backends
+
+from cla_public.libs.counters import CacheCounters, FileCounters, get_counters
+
+
+def _increment(make_counters, threads, increments):
+    counters = make_counters()
+
+    def work():
+        for _ in xrange(increments):
+            counters.incr("benchmark")
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def _cache_counters(config, prefix):
+    # each process connects to the cache itself rather than sharing a socket
+    cache = getattr(backends, config["CACHE_SHARED_TYPE"])(None, config, [], {})
+    return CacheCounters(cache, prefix)
+
+
+def _count_across_processes(make_counters, processes, threads, increments):
+    start = time.time()
+    args = (make_counters, threads, increments)
+    workers = [multiprocessing.Process(target=_increment, args=args) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.time() - start
+
+    expected = processes * threads * increments
+    actual = make_counters().get("benchmark")
+    return {
+        "expected": expected,
+        "actual": actual,
+        "correct": expected == actual,
+        "increments_per_second": int(expected / elapsed),
+    }
+
+
+def counter(processes=4, threads=4, increments=250):
+    """
+    Increment one file backed counter from several processes, each running
+    several threads, and check no increment was lost
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        return _count_across_processes(partial(FileCounters, directory), processes, threads, increments)
+    finally:
+        shutil.rmtree(directory)
+
+
+def cache_counter(processes=4, threads=4, increments=250):
+    """
+    The counter benchmark against the shared cache configured by
+    CACHE_SHARED_TYPE, which must increment atomically (memcached). Needs an
+    app context.
+    """
+    config = current_app.config
+    if not isinstance(get_counters(), CacheCounters):
+        raise ValueError("%s cache does not keep counters" % config.get("CACHE_SHARED_TYPE"))
+    make_counters = partial(_cache_counters, config, "benchmark:%s:" % uuid.uuid4().hex)
+    return _count_across_processes(make_counters, processes, threads, increments)
+
+
+def session_snapshot():
+    """
+    A checker session part way through the means test. Needs a request context.
+    """
+    from cla_public.apps.checker.means_test import MeansTest
+
+    session.clear()
+    session.checker.update(
+        {
+            "category": "debt",
+            "eligibility_check": u"4GH-HJ7-FDK",
+            "AboutYouForm": {
+                "have_partner": "1",
+                "in_dispute": "0",
+                "on_benefits": "0",
+                "have_children": "1",
+                "num_children": 2,
+                "have_dependants": "0",
+                "own_property": "1",
+                "is_employed": "1",
+                "is_self_employed": "0",
+                "aged_60_or_over": "0",
+                "have_savings": "1",
+                "have_valuables": "0",
+                "is_completed": True,
+            },
+            "PropertiesForm": {
+                "properties": [
+                    {
+                        "is_main_home": "1",
+                        "other_shareholders": "0",
+                        "property_value": 20000000,
+                        "mortgage_remaining": 10000000,
+                        "mortgage_payments": 80000,
+                        "is_rented": "0",
+                        "rent_amount": {"per_interval_value": None, "interval_period": "per_month"},
+                        "in_dispute": "0",
+                    }
+                ],
+                "is_completed": True,
+            },
+            "SavingsForm": {"savings": 150000, "investments": 0, "valuables": None, "is_completed": True},
+        }
+    )
+    session.checker["means_test"] = MeansTest()
+    return {"checker": session.checker, "_id": uuid.uuid4()}
+
+
+def session_serializer(iterations=2000):
+    """
+    Time encoding and decoding a checker session with the current and the
+    legacy session serializers. Needs a request context.
+    """
+    from cla_public.apps.checker.session import CheckerTaggedJSONSerializer, LegacyCheckerTaggedJSONSerializer
+
+    snapshot = session_snapshot()
+    result = {}
+    for name, serializer in (
+        ("legacy", LegacyCheckerTaggedJSONSerializer()),
+        ("current", CheckerTaggedJSONSerializer()),
+    ):
+        data = serializer.dumps(snapshot)
+        result["%s_dumps_ms" % name] = timeit.timeit(lambda: serializer.dumps(snapshot), number=iterations) * 1000
+        result["%s_loads_ms" % name] = timeit.timeit(lambda: serializer.loads(data), number=iterations) * 1000
+    result["iterations"] = iterations
+    return result
+
+
+def form_instantiation(batches=5, batch_size=1000):
+    """
+    Time building the larger checker and contact forms in batches, as a long
+    running worker would, to check the cost per form stays the same from
+    the first batch to the last. Needs a request context.
+    """
+    from cla_public.apps.checker.forms import IncomeForm, OutgoingsForm, PropertiesForm, YourBenefitsForm
+    from cla_public.apps.contact.forms import ContactForm
+
+    session_snapshot()
+    result = {}
+    for form_class in (IncomeForm, OutgoingsForm, PropertiesForm, YourBenefitsForm, ContactForm):
+        name = form_class.__name__
+        timings = [
+            timeit.timeit(lambda: form_class(csrf_enabled=False), number=batch_size) * 1000000 / batch_size
+            for _ in xrange(batches)
+        ]
+        result["%s_first_batch_us" % name] = int(timings[0])
+        result["%s_last_batch_us" % name] = int(timings[-1])
+        result["%s_fields" % name] = len(form_class(csrf_enabled=False)._fields)
+    result["forms_per_batch"] = batch_size
+    return result
+
+
+def payload_build(iterations=2000):
+    """
+    Time building the means test payload of each saved form, the whole means
+    test and a new eligibility check with its defaults. Needs a request
+    context.
+    """
+    from cla_public.apps.checker.api import initialise_eligibility_check
+    from cla_public.apps.checker.means_test import MeansTest, PAYLOAD_FORMS
+    from cla_public.libs.utils import flatten
+
+    session_snapshot()
+    forms = [(form, flatten(session.checker[form])) for form in PAYLOAD_FORMS if form in session.checker]
+
+    def means_test():
+        means_test = MeansTest()
+        for form, form_data in forms:
+            means_test.update_from_form(form, form_data)
+        return means_test
+
+    result = {}
+    for form, form_data in forms:
+        result["%s_us" % form] = int(
+            timeit.timeit(lambda: MeansTest.payload(form, form_data), number=iterations) * 1000000 / iterations
+        )
+    result["means_test_us"] = int(timeit.timeit(means_test, number=iterations) * 1000000 / iterations)
+    result["initialise_eligibility_check_us"] = int(
+        timeit.timeit(lambda: initialise_eligibility_check({}), number=iterations) * 1000000 / iterations
+    )
+    result["iterations"] = iterations
+    return result
+
+
+BENCHMARKS = {
+    "cache_counter": cache_counter,
+    "counter": counter,
+    "form_instantiation": form_instantiation,
+    "payload_build": payload_build,
+    "session_serializer": session_serializer,
+}
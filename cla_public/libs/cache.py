@@ -0,0 +1,112 @@
+# coding: utf-8
+"Two tier cache: a small per-worker cache in front of one shared by all workers"
+
+from flask.ext.cache import backends
+from werkzeug.contrib.cache import BaseCache, SimpleCache
+
+from cla_public.libs import metrics
+
+
+TIERS = ("l1", "l2")
+
+
+class TwoTierCache(BaseCache):
+    """
+    Reads are served from the in-process `local` cache where possible and
+    otherwise from the `shared` cache, copying the value into `local`.
+    Writes go to both. Values live in `local` for at most `local_timeout`
+    seconds, which bounds how stale a worker can be after another worker
+    changes the shared value. With a `local_timeout` of None values live in
+    `local` as long as in `shared`, for when nothing else writes to it.
+
+    Counters (`inc`/`dec`) only ever use the shared cache so they stay
+    consistent across workers.
+    """
+
+    def __init__(self, local, shared, local_timeout=30, default_timeout=300):
+        super(TwoTierCache, self).__init__(default_timeout)
+        self.local = local
+        self.shared = shared
+        self.local_timeout = local_timeout
+
+    def _local_timeout(self, timeout):
+        if timeout is None:
+            timeout = self.default_timeout
+        if self.local_timeout is None:
+            return timeout
+        return min(timeout, self.local_timeout) if timeout else self.local_timeout
+
+    def get(self, key):
+        value = self.local.get(key)
+        if value is not None:
+            metrics.incr("cache.l1.hits")
+            return value
+        metrics.incr("cache.l1.misses")
+
+        value = self.shared.get(key)
+        if value is None:
+            metrics.incr("cache.l2.misses")
+            return None
+        metrics.incr("cache.l2.hits")
+        self.local.set(key, value, self._local_timeout(None))
+        return value
+
+    def set(self, key, value, timeout=None):
+        if timeout is None:
+            timeout = self.default_timeout
+        result = self.shared.set(key, value, timeout)
+        self.local.set(key, value, self._local_timeout(timeout))
+        return result
+
+    def add(self, key, value, timeout=None):
+        if timeout is None:
+            timeout = self.default_timeout
+        added = self.shared.add(key, value, timeout)
+        if added:
+            self.local.set(key, value, self._local_timeout(timeout))
+        return added
+
+    def delete(self, key):
+        self.local.delete(key)
+        return self.shared.delete(key)
+
+    def clear(self):
+        self.local.clear()
+        return self.shared.clear()
+
+    def inc(self, key, delta=1):
+        self.local.delete(key)
+        return self.shared.inc(key, delta)
+
+    def dec(self, key, delta=1):
+        self.local.delete(key)
+        return self.shared.dec(key, delta)
+
+    def hit_ratios(self):
+        return {tier: metrics.ratio("cache.%s.hits" % tier, "cache.%s.misses" % tier) for tier in TIERS}
+
+
+def two_tier(app, config, args, kwargs):
+    """
+    Flask-Cache backend factory, used by setting
+    CACHE_TYPE = "cla_public.libs.cache.two_tier"
+
+    CACHE_SHARED_TYPE names the Flask-Cache backend for the shared tier, eg.
+    "filesystem", "memcached" or "redis", configured with the usual CACHE_*
+    settings. "simple" gives a process local stand-in for tests. By default
+    it is "null", and values are only kept by each worker.
+    """
+    shared_type = config.get("CACHE_SHARED_TYPE") or "null"
+    try:
+        shared_factory = getattr(backends, shared_type)
+    except AttributeError:
+        raise ImportError("%s is not a valid FlaskCache backend" % shared_type)
+    shared = shared_factory(app, config, list(args), dict(kwargs))
+
+    local = SimpleCache(threshold=config.get("CACHE_LOCAL_THRESHOLD", 500))
+    return TwoTierCache(
+        local,
+        shared,
+        local_timeout=None if shared_type == "null" else config.get("CACHE_LOCAL_TIMEOUT", 30),
+        default_timeout=kwargs.get("default_timeout", 300),
+    )
@@ -0,0 +1,125 @@
+# coding: utf-8
+"Counters shared by every worker, incremented atomically"
+
+import fcntl
+import os
+import re
+import tempfile
+import threading
+
+from flask import current_app
+from werkzeug.contrib.cache import MemcachedCache, RedisCache, SimpleCache
+
+from cla_public.libs.cache import TwoTierCache
+
+
+class CacheCounters(object):
+    """
+    Counters kept in a cache backend with an atomic increment
+    """
+
+    def __init__(self, cache, prefix="counter:"):
+        self.cache = cache
+        self.prefix = prefix
+
+    def incr(self, name, delta=1):
+        key = self.prefix + name
+        if isinstance(self.cache, MemcachedCache):
+            # memcached only increments existing keys
+            self.cache.add(key, 0, timeout=0)
+        return int(self.cache.inc(key, delta))
+
+    def get(self, name):
+        return int(self.cache.get(self.prefix + name) or 0)
+
+
+class LocalCounters(object):
+    """
+    Counters for this process only, to go with the process local "simple"
+    cache used in tests and development
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self.lock = threading.Lock()
+
+    def incr(self, name, delta=1):
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + delta
+            return self.counts[name]
+
+    def get(self, name):
+        return self.counts.get(name, 0)
+
+
+class FileCounters(object):
+    """
+    Counters kept in files in `directory`, each update serialised by an
+    exclusive flock and each read by a shared one. Safe across threads and
+    processes on one host.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                if not os.path.isdir(directory):
+                    raise
+
+    def path(self, name):
+        return os.path.join(self.directory, re.sub(r"[^\w.-]", "_", name))
+
+    def incr(self, name, delta=1):
+        fd = os.open(self.path(name), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            value = int(os.read(fd, 32) or 0) + delta
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, str(value))
+            return value
+        finally:
+            # closing the file releases the lock
+            os.close(fd)
+
+    def get(self, name):
+        try:
+            with open(self.path(name)) as f:
+                # an increment truncates the file before writing to it
+                fcntl.flock(f, fcntl.LOCK_SH)
+                return int(f.read() or 0)
+        except (IOError, ValueError):
+            return 0
+
+
+def get_counters():
+    """
+    Counters in the shared cache if its backend can increment atomically,
+    otherwise in files under COUNTER_DIR. A process local "simple" cache
+    gets process local counters.
+    """
+    extensions = current_app.extensions
+    if "counters" not in extensions:
+        cache = current_app.cache.cache
+        shared = cache.shared if isinstance(cache, TwoTierCache) else cache
+        if isinstance(shared, (MemcachedCache, RedisCache)):
+            counters = CacheCounters(shared)
+        elif isinstance(shared, SimpleCache):
+            counters = LocalCounters()
+        else:
+            directory = current_app.config.get("COUNTER_DIR") or os.path.join(
+                tempfile.gettempdir(), "cla_public_counters"
+            )
+            counters = FileCounters(directory)
+        extensions["counters"] = counters
+    return extensions["counters"]
+
+
+def incr(name, delta=1):
+    return get_counters().incr(name, delta)
+
+
+def get(name):
+    return get_counters().get(name)
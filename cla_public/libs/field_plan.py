@@ -0,0 +1,44 @@
+# coding: utf-8
+"Per-class field lists for forms, compiled once instead of on every instantiation"
+
+
+class FieldPlanMixin(object):
+    """
+    Form mixin binding fields from a list compiled once per form class.
+
+    The compiled list is the form's declared fields followed by the class's
+    `extra_unbound_fields`. Each instance leaves out the names returned by
+    `skipped_fields()`, which is called before any field is bound, so fields a
+    form would otherwise build and then delete are never built. Skipped
+    fields read as None on the form, the same as deleted ones.
+
+    Neither the compiled list nor the form class is changed per instance.
+    """
+
+    # (name, UnboundField) pairs added after the declared fields
+    extra_unbound_fields = ()
+
+    @classmethod
+    def compiled_fields(cls):
+        # FormMeta builds cls._unbound_fields on first instantiation and resets
+        # it whenever a field is added to or removed from the class
+        declared = cls._unbound_fields
+        plan = cls.__dict__.get("_field_plan")
+        if plan is None or plan[0] is not declared:
+            plan = (declared, tuple(declared) + tuple(cls.extra_unbound_fields))
+            cls._field_plan = plan
+        return plan[1]
+
+    def skipped_fields(self):
+        """Names of declared fields this instance does not need"""
+        return ()
+
+    def __init__(self, *args, **kwargs):
+        fields = type(self).compiled_fields()
+        skipped = frozenset(self.skipped_fields())
+        if skipped:
+            fields = [(name, field) for name, field in fields if name not in skipped]
+            for name in skipped:
+                setattr(self, name, None)
+        self._unbound_fields = fields
+        super(FieldPlanMixin, self).__init__(*args, **kwargs)
@@ -1,10 +1,106 @@
-import markdown2
-import yaml
+import cPickle as pickle
+import hashlib
+import os
+import tempfile
+import threading
 
 from flask import current_app
+from werkzeug.datastructures import ImmutableDict
 
 from cla_public.libs.utils import get_locale
 
+MARKDOWN_FIELDS = ("more_info", "selected_notification")
+
+NO_CONFIG = ImmutableDict()
+
+# path -> (mtime, compiled config)
+_compiled = {}
+_compile_lock = threading.Lock()
+
+
+def compile_form_config(path):
+    """
+    Parses the yaml config for all forms at `path` with the markdown fields of
+    each field and radio option rendered to html
+
+    :return: ImmutableDict - {form name: {field name: field config}}
+    """
+    # only needed when a config file is compiled, not for every form
+    import markdown2
+    import yaml
+
+    def compile_field(field_config):
+        field_config = dict(field_config)
+        for markdown_field in MARKDOWN_FIELDS:
+            if markdown_field in field_config:
+                field_config[markdown_field] = markdown2.markdown(field_config[markdown_field])
+        if "field_options" in field_config:
+            field_config["field_options"] = ImmutableDict(
+                (name, compile_field(option_config))
+                for name, option_config in field_config["field_options"].iteritems()
+            )
+        return ImmutableDict(field_config)
+
+    with open(path) as f:
+        config_data = yaml.load(f.read())
+
+    forms = {}
+    for form_name, form_config in config_data["forms"].iteritems():
+        forms[form_name] = ImmutableDict(
+            (field_name, compile_field(field_config))
+            for field_name, field_config in (form_config.get("fields") or {}).iteritems()
+        )
+    return ImmutableDict(forms)
+
+
+def cache_file(cache_dir, path, mtime):
+    key = hashlib.sha1("%s:%r" % (os.path.abspath(path), mtime)).hexdigest()
+    return os.path.join(cache_dir, "forms_config.%s.pickle" % key)
+
+
+def load_form_config(path, mtime):
+    """
+    Compiles the config at `path`, going through the pickled copies in
+    FORM_CONFIG_CACHE_DIR when it is set
+    """
+    cache_dir = current_app.config.get("FORM_CONFIG_CACHE_DIR")
+    if not cache_dir:
+        return compile_form_config(path)
+
+    filename = cache_file(cache_dir, path, mtime)
+    try:
+        with open(filename, "rb") as f:
+            return pickle.load(f)
+    except (IOError, EOFError, pickle.UnpicklingError):
+        pass
+
+    config = compile_form_config(path)
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        fd, tmp = tempfile.mkstemp(dir=cache_dir)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(config, f, pickle.HIGHEST_PROTOCOL)
+        os.rename(tmp, filename)
+    except (IOError, OSError):
+        current_app.logger.warning("Could not cache forms config in %s", cache_dir, exc_info=True)
+    return config
+
+
+def get_form_config(path):
+    """
+    The compiled config for all forms in the yaml file at `path`, compiled
+    again only when the file changes
+    """
+    mtime = os.path.getmtime(path)
+    compiled = _compiled.get(path)
+    if compiled is None or compiled[0] != mtime:
+        with _compile_lock:
+            compiled = _compiled.get(path)
+            if compiled is None or compiled[0] != mtime:
+                compiled = _compiled[path] = (mtime, load_form_config(path, mtime))
+    return compiled[1]
+
 
 class FormConfigParser(object):
     """
@@ -13,44 +109,22 @@ class FormConfigParser(object):
     Loads help text in to DescriptionRadioField fields
     """
 
-    _markdown_fields = ["more_info", "selected_notification"]
-
     def __init__(self, form_name, config_path=None):
         """
-        Loads form yaml file for all forms and sets the config for a specific form
+        Sets the config for a specific form from the compiled config for all forms
         :param form_name: Class name f form
         :return: None
         """
-        self.fields = {}
-        self.form_config = None
-
         locale = get_locale()
 
         path = config_path or current_app.config["FORM_CONFIG_TRANSLATIONS"][locale]
 
-        with open(path) as f:
-            config_data = yaml.load(f.read())
-
-        if form_name in config_data["forms"]:
-            self.form_config = config_data["forms"][form_name]
-            # Convert markdown fields to markdown
-            for field_name, field_config in self.form_config.get("fields").iteritems():
-                self.fields[field_name] = self.values_to_markdown(field_config)
+        self.form_config = get_form_config(path).get(form_name)
+        self.fields = self.form_config or NO_CONFIG
 
     def __nonzero__(self):
         return self.form_config is not None
 
-    def values_to_markdown(self, field_config):
-        """
-        Converts fields in self._markdown_fields to html from markdown
-        :param field_config:
-        :return:
-        """
-        for markdown_field in self._markdown_fields:
-            if markdown_field in field_config:
-                field_config[markdown_field] = markdown2.markdown(field_config[markdown_field])
-        return field_config
-
     def get(self, field_name, field=None):
         """
         Returns the config for field
@@ -64,14 +138,10 @@ class FormConfigParser(object):
 
             if field and hasattr(field, "add_options_attributes"):
                 # Add help text to individual radios in DescriptionRadioField fields
-                options_attributes = []
-
-                field_options = field_config.get("field_options", {})
-                for radio_field in field:
-                    radio_field_config = self.values_to_markdown(field_options.get(radio_field.field_name, {}))
-                    options_attributes.append(radio_field_config)
-
-                field.add_options_attributes(options_attributes)
+                field_options = field_config.get("field_options", NO_CONFIG)
+                field.add_options_attributes(
+                    [field_options.get(radio_field.field_name, NO_CONFIG) for radio_field in field]
+                )
 
             return field_config
 
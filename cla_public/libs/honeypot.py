@@ -2,6 +2,8 @@ from wtforms import StringField, widgets
 from wtforms.fields.core import UnboundField
 from flask.ext.babel import lazy_gettext as _
 
+from cla_public.libs.field_plan import FieldPlanMixin
+
 
 # This should be something a bot would want to fill in
 FIELD_NAME = "comment"
@@ -23,10 +25,5 @@ class HoneypotField(StringField):
             raise ValueError(self.gettext(u"This field must be left empty"))
 
 
-class Honeypot(object):
-    def __init__(self, *args, **kwargs):
-
-        unbound = UnboundField(HoneypotField, _(u"Leave this field empty"))
-        self._unbound_fields.append((FIELD_NAME, unbound))
-
-        super(Honeypot, self).__init__(*args, **kwargs)
+class Honeypot(FieldPlanMixin):
+    extra_unbound_fields = ((FIELD_NAME, UnboundField(HoneypotField, _(u"Leave this field empty"))),)
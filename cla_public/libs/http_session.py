@@ -0,0 +1,99 @@
+# coding: utf-8
+"Pooled keep-alive HTTP session shared by all outbound API calls"
+
+import logging
+import os
+import threading
+
+from flask import current_app
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+log = logging.getLogger(__name__)
+
+DEFAULT_HTTP_CLIENT = {
+    "pool_connections": 10,
+    "pool_maxsize": 10,
+    "pool_block": False,
+    "keep_alive": True,
+    "retries": {"total": 2, "connect": 2, "read": 0, "backoff_factor": 0.1, "status_forcelist": []},
+    "host_pool_maxsize": {},
+}
+
+_lock = threading.Lock()
+_sessions = {}
+
+
+def http_client_config(app=None):
+    app = app or current_app
+    config = dict(DEFAULT_HTTP_CLIENT)
+    config.update(app.config.get("HTTP_CLIENT", {}))
+    return config
+
+
+def make_retry(retries):
+    """
+    Retries of failures to connect, and of read failures if "read" is set.
+    urllib3 only retries reads of idempotent methods, and the default of no
+    read retries means a request that reached the backend is never resent.
+    """
+    return Retry(
+        total=retries.get("total"),
+        connect=retries.get("connect"),
+        read=retries.get("read"),
+        backoff_factor=retries.get("backoff_factor", 0),
+        status_forcelist=retries.get("status_forcelist") or None,
+        raise_on_status=False,
+    )
+
+
+def make_adapter(config, pool_maxsize=None):
+    return HTTPAdapter(
+        pool_connections=config["pool_connections"],
+        pool_maxsize=pool_maxsize or config["pool_maxsize"],
+        pool_block=config["pool_block"],
+        max_retries=make_retry(config["retries"]),
+    )
+
+
+def create_session(config):
+    session = requests.Session()
+    adapter = make_adapter(config)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    # Per-host limits get their own adapter, mounted on the host prefix
+    for host, maxsize in config["host_pool_maxsize"].items():
+        session.mount(host, make_adapter(config, pool_maxsize=maxsize))
+
+    session.headers["Connection"] = "keep-alive" if config["keep_alive"] else "close"
+    return session
+
+
+def get_http_session(app=None):
+    """
+    Returns the pooled session for this worker process.
+
+    `requests.Session` shares its urllib3 connection pools safely between
+    threads; a new session is created after a fork so pooled sockets are
+    never shared between uwsgi workers.
+    """
+    app = app or current_app._get_current_object()
+    key = (os.getpid(), id(app))
+    session = _sessions.get(key)
+    if session is None:
+        with _lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = create_session(http_client_config(app))
+                _sessions[key] = session
+    return session
+
+
+def close_http_sessions():
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
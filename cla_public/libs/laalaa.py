@@ -1,10 +1,21 @@
 # coding: utf-8
+import copy
+import threading
+import time
+
 from flask import current_app
 from flask.ext.babel import lazy_gettext as _
 import requests
 from werkzeug.urls import url_encode
 
 from cla_common.laalaa import LaalaaProviderCategoriesApiClient, LaaLaaError
+from cla_public.libs.http_session import get_http_session
+from cla_public.libs.ttl_cache import app_cache
+from cla_public.libs.utils import get_locale, normalise_postcode
+
+DEFAULT_SEARCH_TIMEOUT = 10
+
+DEFAULT_CACHE = {"maxsize": 512, "ttl": 5 * 60, "negative_ttl": 60}
 
 
 def kwargs_to_urlparams(**kwargs):
@@ -18,14 +29,67 @@ def laalaa_url(**kwargs):
     )
 
 
-def laalaa_search(**kwargs):
+def laalaa_search(timeout=None, **kwargs):
     try:
-        response = requests.get(laalaa_url(**kwargs))
+        response = get_http_session().get(laalaa_url(**kwargs), timeout=timeout)
         return response.json()
     except (requests.exceptions.RequestException, ValueError) as e:
         raise LaaLaaError(e)
 
 
+def run_search(app, results, index, kwargs, remaining):
+    """
+    Thread body for search_all: store the result of one search, or the
+    exception it raised so the request thread can raise it
+    """
+    with app.app_context():
+        try:
+            results[index] = laalaa_search(timeout=remaining(), **kwargs)
+        except Exception as e:
+            results[index] = e
+
+
+def finished_results(threads, results):
+    """
+    Results of the searches in order, raising the first error in that order
+    """
+    for thread, result in zip(threads, results):
+        if thread.is_alive():
+            raise LaaLaaError("Legal adviser search timed out")
+        if isinstance(result, Exception):
+            raise result
+    return results
+
+
+def search_all(searches, timeout):
+    """
+    Run several searches concurrently within one overall deadline.
+    Results are returned in the order of `searches`; the first failing search
+    in that order raises its exception, as running them in turn would.
+    """
+    deadline = time.time() + timeout
+
+    def remaining():
+        return max(deadline - time.time(), 0)
+
+    if len(searches) == 1:
+        return [laalaa_search(timeout=remaining(), **searches[0])]
+
+    app = current_app._get_current_object()
+    results = [None] * len(searches)
+    threads = [
+        threading.Thread(target=run_search, args=(app, results, index, kwargs, remaining))
+        for index, kwargs in enumerate(searches)
+    ]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        thread.join(remaining())
+
+    return finished_results(threads, results)
+
+
 def get_categories():
     client = LaalaaProviderCategoriesApiClient.singleton(current_app.config["LAALAA_API_HOST"], category_translator=_)
     return client.get_categories()
@@ -42,13 +106,55 @@ def decode_categories(result):
     return result
 
 
-def find(postcode, categories=None, page=1):
+def search(postcode, categories, page):
     if not categories:
         categories = [None]
+    searches = [{"postcode": postcode, "category": category, "page": page} for category in categories]
+    timeout = current_app.config.get("LAALAA_SEARCH_TIMEOUT", DEFAULT_SEARCH_TIMEOUT)
+
+    return merge_results(search_all(searches, timeout))
+
+
+def merge_results(results):
     merged_data = {"results": [], "count": 0}
-    for category in categories:
-        data = laalaa_search(postcode=postcode, category=category, page=page)
-        merged_data["results"].extend(map(decode_categories, data.get("results", [])))
+    for data in results:
+        if "error" in data:
+            merged_data["error"] = data["error"]
+        merged_data["results"].extend(data.get("results", []))
         merged_data["origin"] = data.get("origin")
         merged_data["count"] += data.get("count", 0)
     return merged_data
+
+
+def cache_config():
+    config = dict(DEFAULT_CACHE)
+    config.update(current_app.config.get("LAALAA_CACHE", {}))
+    return config
+
+
+def search_cache():
+    config = cache_config()
+    return app_cache("laalaa_cache", config["maxsize"], config["ttl"])
+
+
+def find(postcode, categories=None, page=1):
+    """
+    Search LAALAA for legal advisers, caching results by postcode, categories
+    and page. Decoded category names are kept per locale.
+    """
+    cache = search_cache()
+    key = (normalise_postcode(postcode), tuple(categories or ()), int(page))
+    entry = cache.get(key)
+    if entry is None:
+        entry = {"data": search(postcode, categories, page), "decoded": {}}
+        # postcodes LAALAA can't find are remembered for less time
+        ttl = cache_config()["negative_ttl"] if "error" in entry["data"] else None
+        cache.set(key, entry, ttl=ttl)
+
+    locale = get_locale()
+    decoded = entry["decoded"].get(locale)
+    if decoded is None:
+        decoded = copy.deepcopy(entry["data"])
+        decoded["results"] = map(decode_categories, decoded["results"])
+        entry["decoded"][locale] = decoded
+    return dict(decoded)
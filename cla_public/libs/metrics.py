@@ -0,0 +1,34 @@
+# coding: utf-8
+"In-process counters for cache hit rates and similar worker metrics"
+
+from collections import Counter
+import threading
+
+
+_lock = threading.Lock()
+_counters = Counter()
+
+
+def incr(name, value=1):
+    with _lock:
+        _counters[name] += value
+
+
+def get(name):
+    return _counters.get(name, 0)
+
+
+def ratio(hits_name, misses_name):
+    hits = get(hits_name)
+    total = hits + get(misses_name)
+    return float(hits) / total if total else None
+
+
+def snapshot():
+    with _lock:
+        return dict(_counters)
+
+
+def reset():
+    with _lock:
+        _counters.clear()
@@ -24,93 +24,132 @@ def to_amount(value):
     return amount
 
 
+# Factor turning an amount per interval in to an amount per month
+MULTIPLIERS = dict((interval, info["multiply_factor"]) for interval, info in MIBase._intervals_dict.items())
+
+
+def read_only(*args, **kwargs):
+    raise TypeError("MoneyInterval is read only")
+
+
 class MoneyInterval(dict):
+    """
+    An amount in pence per interval. Read only, so instances are shared
+    rather than copied. The dict items are its JSON, as sent to the API and
+    kept in the session.
+    """
+
+    __slots__ = ("_amount", "_interval")
+
     def __init__(self, *args, **kwargs):
-        super(MoneyInterval, self).__init__({"per_interval_value": None, "interval_period": "per_month"})
+        amount = None
+        interval = "per_month"
 
         if len(args) > 0:
             value = args[0]
             if isinstance(value, MoneyInterval):
-                self.amount = value.amount
-                self.interval = value.interval
+                amount, interval = value._amount, value._interval
             elif isinstance(value, dict):
-                self.amount = value.get("per_interval_value")
-                if "interval_period" in value:
-                    interval = value.get("interval_period")
-                    if interval:
-                        self.interval = interval
+                amount = self.to_pence(value.get("per_interval_value"))
+                interval = self.valid_interval(value.get("interval_period") or interval)
             else:
-                self.amount = value
+                amount = self.to_pence(value)
 
-            if len(args) > 1:
-                self.interval = args[1]
+            if len(args) > 1 and args[1] is not None:
+                interval = self.valid_interval(args[1])
 
         else:
-            self.amount = kwargs.get("per_interval_value")
-            self.interval = kwargs.get("interval_period", "per_month")
+            amount = self.to_pence(kwargs.get("per_interval_value"))
+            if kwargs.get("interval_period") is not None:
+                interval = self.valid_interval(kwargs["interval_period"])
 
-    @property
-    def amount(self):
-        return self.get("per_interval_value")
+        self._amount = amount
+        self._interval = interval
+        dict.__init__(self, per_interval_value=amount, interval_period=interval)
 
-    @amount.setter
-    def amount(self, value):
+    @staticmethod
+    def to_pence(value):
         """
         Assumes integer is amount in pence, float or Decimal is amount in
         pounds and first 2 decimal places are pence. String is converted to
         Decimal first.
         """
-
+        if value is None or type(value) is int:
+            return value
         try:
-            self["per_interval_value"] = to_amount(value)
-
+            return to_amount(value)
         except (InvalidOperation, ValueError):
             raise ValueError("Invalid value for amount {0} ({1})".format(value, type(value)))
 
+    @staticmethod
+    def valid_interval(value):
+        if value not in MULTIPLIERS:
+            raise ValueError(value)
+        return value
+
+    @property
+    def amount(self):
+        return self._amount
+
     @property
     def interval(self):
-        return self.get("interval_period")
+        return self._interval
 
-    @interval.setter
-    def interval(self, value):
-        if value is not None:
-            if value in MIBase._intervals_dict:
-                self["interval_period"] = value
-            else:
-                raise ValueError(value)
+    __setitem__ = __delitem__ = update = setdefault = pop = popitem = clear = read_only
 
-    def __add__(self, other):
-        if other == 0:
-            other = MoneyInterval(0)
+    def __copy__(self):
+        return self
 
-        if not isinstance(other, MoneyInterval):
-            if self.is_money_interval(other):
-                other = MoneyInterval(other)
-            else:
-                raise ValueError(other)
+    def __deepcopy__(self, memo):
+        return self
 
-        first = self.per_month()
-        second = other.per_month()
+    def __reduce__(self):
+        return MoneyInterval, (self._amount, self._interval)
 
-        return MoneyInterval(first.amount + second.amount)
+    def __add__(self, other):
+        return sum_per_month((self, other))
 
     def __radd__(self, other):
-        return self.__add__(other)
+        return sum_per_month((other, self))
 
     def per_month(self):
-        if self.amount is None or self.interval == "":
+        if self._amount is None:
             return MoneyInterval(0)
 
-        if self.interval == "per_month":
+        if self._interval == "per_month":
             return self
 
-        multiplier = MIBase._intervals_dict[self.interval]["multiply_factor"]
-
-        return MoneyInterval(int(self.amount * multiplier))
+        return MoneyInterval(int(self._amount * MULTIPLIERS[self._interval]))
 
     @classmethod
     def is_money_interval(cls, other):
+        if isinstance(other, MoneyInterval):
+            return True
         if hasattr(other, "keys") and callable(other.keys):
             keys = set(other.keys())
             return keys == set(["per_interval_value", "interval_period"])
         return False
+
+
+def sum_per_month(values):
+    """
+    Total per month of money intervals, or of dicts like them, in one pass.
+    Zeros are allowed, as for sum(), and unknown amounts count as nothing.
+    """
+    total = 0
+    for value in values:
+        if not isinstance(value, MoneyInterval):
+            if value == 0:
+                continue
+            if not MoneyInterval.is_money_interval(value):
+                raise ValueError(value)
+            value = MoneyInterval(value)
+
+        amount = value._amount
+        if amount is not None:
+            if value._interval == "per_month":
+                total += amount
+            else:
+                total += int(amount * MULTIPLIERS[value._interval])
+
+    return MoneyInterval(total)
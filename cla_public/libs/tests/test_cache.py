@@ -0,0 +1,56 @@
+import unittest
+
+from werkzeug.contrib.cache import NullCache, SimpleCache
+
+from cla_public.apps.base.tests import FlaskAppTestCase
+from cla_public.libs import metrics
+from cla_public.libs.cache import TwoTierCache, two_tier
+
+
+class TestTwoTierCache(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+        self.shared = SimpleCache()
+        self.worker_a = TwoTierCache(SimpleCache(), self.shared)
+        self.worker_b = TwoTierCache(SimpleCache(), self.shared)
+
+    def test_value_shared_between_workers(self):
+        self.worker_a.set("key", "value")
+        self.assertEqual("value", self.worker_b.get("key"))
+        self.assertEqual("value", self.worker_b.get("key"))
+        self.assertEqual({"l1": 0.5, "l2": 1.0}, self.worker_b.hit_ratios())
+
+    def test_local_copy_expires_sooner(self):
+        worker = TwoTierCache(SimpleCache(), self.shared, local_timeout=30)
+        worker.set("key", "value", timeout=3600)
+        expires, _ = worker.local._cache["key"]
+        self.assertLessEqual(expires - worker.shared._cache["key"][0], -3000)
+
+    def test_delete_removes_from_both_tiers(self):
+        self.worker_a.set("key", "value")
+        self.worker_a.delete("key")
+        self.assertIsNone(self.worker_a.get("key"))
+
+    def test_counters_use_shared_tier(self):
+        self.worker_a.set("count", 1)
+        self.worker_b.get("count")
+        self.worker_a.inc("count")
+        self.worker_b.inc("count")
+        self.assertEqual(3, self.shared.get("count"))
+        self.assertEqual(3, self.worker_a.get("count"))
+
+
+class TestCacheConfiguration(FlaskAppTestCase):
+    def test_app_cache_is_two_tier(self):
+        self.assertIsInstance(self.app.cache.cache, TwoTierCache)
+        self.app.cache.set("key", "value")
+        self.assertEqual("value", self.app.cache.cache.shared.get("key"))
+
+    def test_shared_tier_off_by_default(self):
+        config = dict(self.app.config)
+        del config["CACHE_SHARED_TYPE"]
+        cache = two_tier(self.app, config, [], {"default_timeout": 300})
+        self.assertIsInstance(cache.shared, NullCache)
+        cache.set("key", "value", timeout=3600)
+        self.assertEqual("value", cache.get("key"))
+        self.assertEqual(3600, cache._local_timeout(3600))
@@ -0,0 +1,73 @@
+import fcntl
+import shutil
+import tempfile
+import threading
+import unittest
+
+from mock import patch
+
+from cla_public.apps.base.tests import FlaskAppTestCase
+from cla_public.libs import benchmarks, counters
+
+
+class TestFileCounters(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.counters = counters.FileCounters(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_incr(self):
+        self.assertEqual(0, self.counters.get("cait_counter"))
+        self.assertEqual(1, self.counters.incr("cait_counter"))
+        self.assertEqual(3, self.counters.incr("cait_counter", 2))
+        self.assertEqual(3, self.counters.get("cait_counter"))
+
+    def test_concurrent_increments_not_lost(self):
+        def work():
+            for _ in range(50):
+                self.counters.incr("count")
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(400, self.counters.get("count"))
+
+    def test_benchmark_across_processes(self):
+        result = benchmarks.counter(processes=2, threads=2, increments=50)
+        self.assertTrue(result["correct"], result)
+
+    def test_read_waits_for_increment(self):
+        self.counters.incr("count")
+        with open(self.counters.path("count"), "r+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            reader = threading.Thread(target=lambda: self.counters.get("count"))
+            reader.start()
+            reader.join(0.1)
+            self.assertTrue(reader.is_alive())
+        reader.join()
+
+
+class TestCounterSelection(FlaskAppTestCase):
+    def test_simple_cache_uses_local_counters(self):
+        self.assertIsInstance(counters.get_counters(), counters.LocalCounters)
+        self.assertEqual(1, counters.incr("cait_counter"))
+
+    def test_cache_benchmark_needs_atomic_cache(self):
+        self.assertRaises(ValueError, benchmarks.cache_counter)
+
+    def test_cache_benchmark_across_processes(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+
+        def make_counters(config, prefix):
+            # stands in for memcached, which increments atomically across processes
+            return counters.FileCounters(directory)
+
+        with patch.object(benchmarks, "_cache_counters", make_counters):
+            with patch.object(benchmarks, "get_counters", return_value=counters.CacheCounters(None)):
+                result = benchmarks.cache_counter(processes=2, threads=2, increments=50)
+        self.assertTrue(result["correct"], result)
@@ -0,0 +1,45 @@
+import unittest
+
+from wtforms import Form, StringField
+
+from cla_public.libs.field_plan import FieldPlanMixin
+from cla_public.libs.honeypot import FIELD_NAME, Honeypot
+
+
+class HoneypotForm(Honeypot, Form):
+    name = StringField()
+    email = StringField()
+
+
+class SkippingForm(FieldPlanMixin, Form):
+    name = StringField()
+    email = StringField()
+
+    def __init__(self, *args, **kwargs):
+        self.skip = kwargs.pop("skip", ())
+        super(SkippingForm, self).__init__(*args, **kwargs)
+
+    def skipped_fields(self):
+        return self.skip
+
+
+class TestFieldPlan(unittest.TestCase):
+    def test_honeypot_added_once(self):
+        for _ in range(3):
+            form = HoneypotForm()
+        self.assertEqual(["name", "email", FIELD_NAME], list(form._fields))
+        self.assertEqual(2, len(HoneypotForm._unbound_fields))
+
+    def test_skipped_fields_not_bound(self):
+        form = SkippingForm(skip=["email"])
+        self.assertEqual(["name"], list(form._fields))
+        self.assertIsNone(form.email)
+        self.assertEqual(["name", "email"], list(SkippingForm()._fields))
+
+    def test_plan_follows_class_changes(self):
+        class ChangingForm(FieldPlanMixin, Form):
+            name = StringField()
+
+        ChangingForm()
+        ChangingForm.email = StringField()
+        self.assertEqual(["name", "email"], list(ChangingForm()._fields))
@@ -0,0 +1,29 @@
+import mock
+
+from cla_public.apps.base.tests import FlaskAppTestCase
+from cla_public.libs import http_session
+
+
+class HttpSessionTest(FlaskAppTestCase):
+    def tearDown(self):
+        http_session.close_http_sessions()
+        super(HttpSessionTest, self).tearDown()
+
+    def test_session_is_shared(self):
+        self.assertIs(http_session.get_http_session(), http_session.get_http_session())
+
+    def test_new_session_after_fork(self):
+        session = http_session.get_http_session()
+        with mock.patch("os.getpid", return_value=-1):
+            self.assertIsNot(session, http_session.get_http_session())
+
+    def test_pool_configuration(self):
+        self.app.config["HTTP_CLIENT"] = dict(
+            self.app.config["HTTP_CLIENT"], pool_maxsize=3, host_pool_maxsize={"http://laalaa": 1}
+        )
+        session = http_session.get_http_session()
+        adapter = session.get_adapter("http://backend/")
+        self.assertEqual(adapter._pool_maxsize, 3)
+        self.assertEqual(adapter.max_retries.read, 0)
+        self.assertEqual(session.get_adapter("http://laalaa/legal-advisers/")._pool_maxsize, 1)
+        self.assertEqual(session.headers["Connection"], "keep-alive")
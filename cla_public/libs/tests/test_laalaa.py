@@ -1,5 +1,6 @@
 import json
 import logging
+import time
 import unittest
 from mock import patch
 
@@ -182,6 +183,86 @@ class LaaLaaTest(unittest.TestCase):
             self.assertEquals(len(result["results"]), 6)
             self.assertEquals(result["count"], 6)
 
+    @patch("cla_public.libs.laalaa.laalaa_search")
+    def test_search_results_keep_category_order(self, mock_laalaa_search):
+        def search(timeout=None, **kwargs):
+            if kwargs["category"] == "a":
+                time.sleep(0.05)
+            return {"results": [{"name": kwargs["category"]}], "count": 1}
+
+        mock_laalaa_search.side_effect = search
+        with patch("cla_public.libs.laalaa.get_categories") as mock_get_categories:
+            mock_get_categories.return_value = self.laa_provider_categories_result
+            result = laalaa.find(postcode="SW1A 1AA", categories=["a", "b", "c"])
+            self.assertEquals(["a", "b", "c"], [r["name"] for r in result["results"]])
+
+    @patch("cla_public.libs.laalaa.laalaa_search")
+    def test_first_failing_search_raises(self, mock_laalaa_search):
+        def search(timeout=None, **kwargs):
+            if kwargs["category"] != "a":
+                raise laalaa.LaaLaaError(kwargs["category"])
+            return self.laalaa_search_result
+
+        mock_laalaa_search.side_effect = search
+        with self.assertRaises(laalaa.LaaLaaError) as context:
+            laalaa.find(postcode="SW1A 1AA", categories=["a", "b", "c"])
+        self.assertEquals("b", str(context.exception))
+
+    @patch("cla_public.libs.laalaa.laalaa_search")
+    def test_unexpected_search_error_raised(self, mock_laalaa_search):
+        def search(timeout=None, **kwargs):
+            if kwargs["category"] == "b":
+                raise KeyError("results")
+            return self.laalaa_search_result
+
+        mock_laalaa_search.side_effect = search
+        with self.assertRaises(KeyError):
+            laalaa.find(postcode="SW1A 1AA", categories=["a", "b"])
+
+    @patch("cla_public.libs.laalaa.laalaa_search")
+    def test_searches_share_a_deadline(self, mock_laalaa_search):
+        mock_laalaa_search.side_effect = lambda timeout=None, **kwargs: time.sleep(0.5)
+        self.app.config["LAALAA_SEARCH_TIMEOUT"] = 0.1
+        with self.assertRaises(laalaa.LaaLaaError):
+            laalaa.find(postcode="SW1A 1AA", categories=["a", "b"])
+
+    @patch("cla_public.libs.laalaa.laalaa_search")
+    def test_repeat_search_is_cached(self, mock_laalaa_search):
+        mock_laalaa_search.return_value = self.laalaa_search_result
+        with patch("cla_public.libs.laalaa.get_categories") as mock_get_categories:
+            mock_get_categories.return_value = self.laa_provider_categories_result
+            first = laalaa.find(postcode="SW1A 1AA", categories=["a"])
+            first["current_page"] = 1
+            second = laalaa.find(postcode="sw1a1aa ", categories=["a"])
+            self.assertEquals(1, mock_laalaa_search.call_count)
+            self.assertEquals(first["results"], second["results"])
+            self.assertNotIn("current_page", second)
+
+            laalaa.find(postcode="SW1A 1AA", categories=["a"], page=2)
+            self.assertEquals(2, mock_laalaa_search.call_count)
+
+    @patch("cla_public.libs.laalaa.laalaa_search")
+    def test_postcode_not_found_cached_briefly(self, mock_laalaa_search):
+        mock_laalaa_search.return_value = {"error": "Postcode not found"}
+        self.app.config["LAALAA_CACHE"] = {"negative_ttl": 0}
+        self.assertEquals("Postcode not found", laalaa.find(postcode="ZZ99 9ZZ")["error"])
+        laalaa.find(postcode="ZZ99 9ZZ")
+        self.assertEquals(2, mock_laalaa_search.call_count)
+
+    @patch("cla_public.libs.laalaa.laalaa_search")
+    def test_categories_decoded_per_locale(self, mock_laalaa_search):
+        mock_laalaa_search.return_value = {"results": [{"categories": ["MED"]}], "count": 1}
+        with patch("cla_public.libs.laalaa.get_categories") as mock_get_categories:
+            mock_get_categories.return_value = self.laa_provider_categories_result
+            result = laalaa.find(postcode="SW1A 1AA")
+            self.assertEquals(["Clinical negligence"], result["results"][0]["categories"])
+
+            mock_get_categories.return_value = {"med": "Esgeulustod clinigol"}
+            with patch("cla_public.libs.laalaa.get_locale", return_value="cy"):
+                result = laalaa.find(postcode="SW1A 1AA")
+            self.assertEquals(["Esgeulustod clinigol"], result["results"][0]["categories"])
+            self.assertEquals(1, mock_laalaa_search.call_count)
+
     def test_postcode_info_is_scottish(self):
         scottish_postcode_prefixes = LaaLaaView.get_scottish_postcode_prefixes()
         for scottish_postcode_prefix in scottish_postcode_prefixes:
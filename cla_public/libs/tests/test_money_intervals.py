@@ -1,7 +1,10 @@
+import copy
 from decimal import Decimal
+import json
+import pickle
 import unittest
 
-from cla_public.libs.money_interval import MoneyInterval
+from cla_public.libs.money_interval import MoneyInterval, sum_per_month
 
 
 class TestMoneyInterval(unittest.TestCase):
@@ -53,12 +56,24 @@ class TestMoneyInterval(unittest.TestCase):
         self.assertEqual(500, mint.amount)
         self.assertEqual("per_week", mint.interval)
 
-    def test_setters(self):
-        mint = MoneyInterval()
-        mint.amount = 100
-        mint.interval = "per_week"
-        self.assertEqual(100, mint.amount)
-        self.assertEqual("per_week", mint.interval)
+    def test_read_only(self):
+        mint = MoneyInterval(100, "per_week")
+        with self.assertRaises(AttributeError):
+            mint.amount = 200
+        with self.assertRaises(TypeError):
+            mint["interval_period"] = "per_month"
+        with self.assertRaises(TypeError):
+            mint.update(per_interval_value=200)
+        self.assertEqual({"per_interval_value": 100, "interval_period": "per_week"}, mint)
+
+    def test_copies_are_shared(self):
+        mint = MoneyInterval(100, "per_week")
+        self.assertIs(mint, copy.deepcopy({"rent": mint})["rent"])
+        self.assertEqual(mint, pickle.loads(pickle.dumps(mint)))
+
+    def test_json(self):
+        mint = MoneyInterval("1.50", "per_week")
+        self.assertEqual({"per_interval_value": 150, "interval_period": "per_week"}, json.loads(json.dumps(mint)))
 
     def test_normalize_to_per_month(self):
         mint = MoneyInterval(100, "per_week")
@@ -99,3 +114,15 @@ class TestMoneyInterval(unittest.TestCase):
         total = mint + 0
         self.assertEqual(3, total.amount)
         self.assertEqual("per_month", total.interval)
+
+    def test_sum_per_month(self):
+        values = [MoneyInterval(100, "per_week"), {"per_interval_value": 100, "interval_period": "per_month"}, 0]
+        total = sum_per_month(values + [MoneyInterval()])
+        self.assertEqual(sum(map(MoneyInterval, values)), total)
+        self.assertEqual(533, total.amount)
+        self.assertEqual("per_month", total.interval)
+        self.assertEqual(MoneyInterval(0), sum_per_month([]))
+
+    def test_sum_per_month_invalid(self):
+        with self.assertRaises(ValueError):
+            sum_per_month([MoneyInterval(100), 1])
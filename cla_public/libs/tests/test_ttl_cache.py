@@ -0,0 +1,38 @@
+import unittest
+
+from cla_public.libs.ttl_cache import TTLCache
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.cache = TTLCache(maxsize=2, ttl=10, timer=self.clock)
+
+    def test_entries_expire(self):
+        self.cache.set("a", 1)
+        self.clock.now = 9
+        self.assertEqual(1, self.cache.get("a"))
+        self.clock.now = 10
+        self.assertIsNone(self.cache.get("a"))
+
+    def test_per_entry_ttl(self):
+        self.cache.set("a", 1, ttl=1)
+        self.clock.now = 2
+        self.assertNotIn("a", self.cache)
+
+    def test_least_recently_used_evicted(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+        self.assertEqual(1, self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(2, len(self.cache))
@@ -0,0 +1,118 @@
+# coding: utf-8
+"Bounded in-process cache with per-entry expiry"
+
+from collections import OrderedDict
+import threading
+import time
+
+from flask import current_app
+
+from cla_public.libs import metrics
+
+_extension_lock = threading.Lock()
+
+
+class TTLCache(object):
+    """
+    Thread-safe mapping which expires entries after `ttl` seconds and evicts
+    the least recently used entry once it holds `maxsize` entries.
+
+    When `name` is given, hits and misses are counted as `<name>.hits` and
+    `<name>.misses` in `cla_public.libs.metrics`.
+    """
+
+    def __init__(self, maxsize=256, ttl=300, name=None, timer=time.time):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self.timer = timer
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _count(self, outcome):
+        if self.name:
+            metrics.incr("{0}.{1}".format(self.name, outcome))
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.pop(key, None)
+            if item is not None:
+                expires, value = item
+                if expires > self.timer():
+                    # re-insert to mark as most recently used
+                    self._data[key] = item
+                    self._count("hits")
+                    return value
+        self._count("misses")
+        return default
+
+    def set(self, key, value, ttl=None):
+        expires = self.timer() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (expires, value)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            return item is not None and item[0] > self.timer()
+
+
+class SingleFlight(object):
+    """
+    Collapses concurrent calls for the same key into one call of `func`;
+    callers arriving while it runs wait for and share its result or exception.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {"done": threading.Event()}
+
+        if not leader:
+            call["done"].wait()
+            if "error" in call:
+                raise call["error"]
+            return call["result"]
+
+        try:
+            call["result"] = func()
+            return call["result"]
+        except Exception as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call["done"].set()
+
+
+def app_cache(name, maxsize, ttl):
+    """
+    The TTLCache named `name` belonging to the current app, created on first use
+    """
+    extensions = current_app.extensions
+    if name not in extensions:
+        with _extension_lock:
+            if name not in extensions:
+                extensions[name] = TTLCache(maxsize=maxsize, ttl=ttl, name=name)
+    return extensions[name]
@@ -1,11 +1,12 @@
 import contextlib
 import logging
+import re
 from collections import Mapping
 
 from flask import current_app, request
 from flask.ext.babel import refresh
 
-from cla_public.apps.checker.constants import CATEGORIES
+from cla_public.apps.checker.categories import category_registry
 
 log = logging.getLogger(__name__)
 
@@ -22,13 +23,30 @@ class classproperty(object):
         return self.getter(owner)
 
 
-def get_locale():
+def normalise_postcode(postcode):
+    return re.sub(r"\s+", "", postcode or "").upper()
+
+
+def request_locale():
     if request and request.cookies.get("locale"):
         return request.cookies.get("locale")[:2]
     language_keys = [key for key, _ in current_app.config.get("LANGUAGES", {})]
     return request.accept_languages.best_match(language_keys) or "en"
 
 
+def get_locale():
+    """
+    The locale from the locale cookie or the Accept-Language header, worked
+    out once per request
+    """
+    if not request:
+        return request_locale()
+    locale = getattr(request, "cla_locale", None)
+    if locale is None:
+        locale = request.cla_locale = request_locale()
+    return locale
+
+
 @contextlib.contextmanager
 def override_locale(locale):
     def set_locale_selector_func(fn):
@@ -98,8 +116,5 @@ def flatten(dict_, prefix=""):
 
 
 def category_id_to_name(category_id):
-    def selected_name(category):
-        return category[0] == category_id and category[1]
-
-    selected = filter(None, map(selected_name, CATEGORIES))
-    return selected[0] if selected else None
+    category = category_registry.get(category_id)
+    return category.label if category else None
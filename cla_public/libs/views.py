@@ -111,8 +111,9 @@ class SessionBackedFormView(AjaxOrNormalMixin, HasFormMixin, RequiresSession, vi
         """
         Store the form data in the session
         """
-        session.checker[self.form_class.__name__] = dict(self.form.data.items())
-        session.checker[self.form_class.__name__]["is_completed"] = True
+        data = dict(self.form.data.items())
+        data["is_completed"] = True
+        session.checker[self.form_class.__name__] = data
 
     def remove_form_data_from_session(self):
         """
@@ -114,6 +114,29 @@ def download_means_test():
     s.close()
 
 
+@manager.command
+def compile_templates():
+    """Compile all templates into TEMPLATE_CACHE_DIR"""
+    from cla_public.django_to_jinja import compile_templates
+
+    if not app.config.get("TEMPLATE_CACHE_DIR"):
+        print("TEMPLATE_CACHE_DIR is not set")
+        sys.exit(1)
+    names = compile_templates(app)
+    print("Compiled %d templates into %s" % (len(names), app.config["TEMPLATE_CACHE_DIR"]))
+
+
+@manager.command
+def benchmark(name):
+    """Run one of the benchmarks in cla_public.libs.benchmarks"""
+    from cla_public.libs.benchmarks import BENCHMARKS
+
+    with app.test_request_context():
+        result = BENCHMARKS[name]()
+    for key, value in sorted(result.items()):
+        print("%s: %s" % (key, value))
+
+
 def _make_context():
     return {"app": app}
 